@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Import Time Benchmark
+
+Measures the startup cost of the budget dashboard entry points with
+``python -X importtime`` and checks that plotting libraries are only
+loaded by the code paths that draw charts.
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+# Module name -> directory it is imported from
+ENTRY_POINTS = {
+    "generate_sample_assets": PROJECT_DIR,
+    "custom_analysis": PROJECT_DIR / "examples",
+}
+
+# Libraries each entry point must not load at import time
+LAZY_MODULES = {
+    "generate_sample_assets": ["matplotlib", "seaborn", "plotly"],
+    "custom_analysis": ["matplotlib", "seaborn", "plotly"],
+}
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)")
+
+def measure_import(module, path):
+    """
+    Import a module in a fresh interpreter and parse the importtime report.
+
+    Args:
+        module: Module name to import
+        path: Directory to run the interpreter from
+
+    Returns:
+        dict: Cumulative import time in milliseconds for every loaded module
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=path, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            cumulative[match.group(3)] = int(match.group(2)) / 1000
+    return cumulative
+
+def benchmark_entry_point(module, path, repeat=5):
+    """
+    Measure an entry point several times and keep the fastest run.
+
+    Returns:
+        dict: Import time, the top-level libraries it loaded and any lazy-module violations
+    """
+    runs = [measure_import(module, path) for _ in range(repeat)]
+    best = min(runs, key=lambda run: run.get(module, float("inf")))
+    loaded = sorted({name.split(".")[0] for name in best})
+
+    return {
+        "import_ms": best.get(module, 0.0),
+        "loaded_libraries": [name for name in loaded if name in ("numpy", "pandas", "matplotlib", "seaborn", "plotly")],
+        "eager_imports": [name for name in LAZY_MODULES.get(module, []) if name in loaded]
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import time of the budget dashboard scripts.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per entry point (fastest is kept)")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if any entry point imports slower than this")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {}
+    failures = []
+    for module, path in ENTRY_POINTS.items():
+        results[module] = benchmark_entry_point(module, path, args.repeat)
+        stats = results[module]
+        print(f"{module:<25} {stats['import_ms']:8.1f} ms  loads: {', '.join(stats['loaded_libraries']) or '-'}")
+
+        if stats["eager_imports"]:
+            failures.append(f"{module} eagerly imports {', '.join(stats['eager_imports'])}")
+        if args.max_ms is not None and stats["import_ms"] > args.max_ms:
+            failures.append(f"{module} took {stats['import_ms']:.1f} ms (limit {args.max_ms:.1f} ms)")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
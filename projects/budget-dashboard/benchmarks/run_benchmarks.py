@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Hot Path Benchmarks
+
+Times sample data generation, every chart method, the end-to-end asset
+build and every CustomFinancialAnalyzer analysis on seeded synthetic data
+at several dataset sizes. Wall-clock time and peak traced memory are saved
+as JSON so runs from different commits can be compared.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "examples"))
+
+import pandas as pd
+
+from generate_sample_assets import SampleDataGenerator
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+SEED = 42
+
+# analyze_* calls benchmarked on CustomFinancialAnalyzer
+ANALYSES = {
+    "analyze_debt_payoff_simulation": {"debt_amount": 15000, "monthly_payment": 500, "interest_rate": 0.18},
+    "analyze_emergency_fund_adequacy": {"target_months": 6},
+    "analyze_spending_elasticity": {"category": "Food & Dining", "percentage_change": -0.2},
+    "analyze_weekend_vs_weekday_patterns": {},
+    "analyze_subscription_roi": {},
+}
+
+def measure(func, repeat):
+    """
+    Time a callable and record its peak traced memory.
+
+    The timed runs are done without tracing; one extra traced run gives the
+    peak, since tracemalloc slows allocation-heavy code.
+
+    Returns:
+        dict: min/mean seconds over the timed runs and peak_mb
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "min_s": min(timings),
+        "mean_s": sum(timings) / len(timings),
+        "peak_mb": peak / 1e6
+    }
+
+def to_analyzer_frame(data):
+    """Rename sample generator columns to the cleaned-transaction layout the analyzers use."""
+    return pd.DataFrame({
+        "Transaction Date": data["date"],
+        "Description": data["description"],
+        "Merchant": data["merchant"],
+        "Amount": data["amount"],
+        "Category_Clean": data["category"]
+    })
+
+def benchmark_generation(size, repeat):
+    generator = SampleDataGenerator(seed=SEED)
+    return {"generate_sample_data": measure(lambda: generator.generate_sample_data(size), repeat)}
+
+def benchmark_charts(data, repeat, profile, images_dir):
+    generator = SampleDataGenerator(seed=SEED, profile=profile)
+    generator.images_dir = images_dir
+
+    results = {"aggregate_cube": measure(lambda: generator.aggregate_cube(data.copy(deep=False)), repeat)}
+    cube = generator.aggregate_cube(data)
+    for method_name in generator.CHART_METHODS:
+        results[method_name] = measure(lambda: getattr(generator, method_name)(cube), repeat)
+    return results
+
+def benchmark_end_to_end(size, repeat, profile, images_dir):
+    def run():
+        generator = SampleDataGenerator(seed=SEED, profile=profile)
+        generator.images_dir = images_dir
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator.generate_all_documentation_assets(size, use_cache=False)
+
+    return {"generate_all_documentation_assets": measure(run, repeat)}
+
+def benchmark_analyses(data, repeat):
+    try:
+        from custom_analysis import CustomFinancialAnalyzer
+        analyzer = CustomFinancialAnalyzer(to_analyzer_frame(data))
+    except ImportError as e:
+        print(f"  Skipping analysis benchmarks ({e})")
+        return {}
+
+    results = {}
+    for method_name, kwargs in ANALYSES.items():
+        def run():
+            # Start cold so the result cache does not hide the base aggregates
+            analyzer.invalidate_cache()
+            getattr(analyzer, method_name)(**kwargs)
+        results[method_name] = measure(run, repeat)
+    return results
+
+def compare(results, baseline_path, threshold):
+    """Print benchmarks whose min time regressed by more than threshold versus a baseline file."""
+    baseline = json.loads(Path(baseline_path).read_text())["results"]
+    regressions = []
+    for size, benchmarks in results.items():
+        for name, stats in benchmarks.items():
+            old = baseline.get(size, {}).get(name)
+            if old and stats["min_s"] > old["min_s"] * (1 + threshold):
+                regressions.append(f"{name} @ {size} rows: {old['min_s']:.3f}s -> {stats['min_s']:.3f}s")
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    return regressions
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=PROJECT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark data generation, charts and analyses.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Dataset sizes in rows")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark")
+    parser.add_argument("--profile", default="draft", help="Render profile for chart benchmarks")
+    parser.add_argument("--skip", nargs="*", default=[], choices=["generation", "charts", "end_to_end", "analyses"],
+                        help="Benchmark groups to skip")
+    parser.add_argument("--output", default="benchmark-results.json", help="JSON file for the results")
+    parser.add_argument("--compare", default=None, help="Baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown before flagging (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        images_dir = Path(tmp_dir)
+        for size in args.sizes:
+            print(f"Benchmarking {size:,} rows...")
+            data = SampleDataGenerator(seed=SEED).generate_sample_data(size)
+            size_results = {}
+            if "generation" not in args.skip:
+                size_results.update(benchmark_generation(size, args.repeat))
+            if "charts" not in args.skip:
+                size_results.update(benchmark_charts(data, args.repeat, args.profile, images_dir))
+            if "end_to_end" not in args.skip:
+                size_results.update(benchmark_end_to_end(size, args.repeat, args.profile, images_dir))
+            if "analyses" not in args.skip:
+                size_results.update(benchmark_analyses(data, args.repeat))
+
+            for name, stats in size_results.items():
+                print(f"  {name:<40} {stats['min_s']:8.3f}s  peak {stats['peak_mb']:8.1f} MB")
+            results[str(size)] = size_results
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "profile": args.profile,
+        "repeat": args.repeat,
+        "results": results
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
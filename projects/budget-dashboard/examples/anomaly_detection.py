@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Streaming Anomaly Detection
+
+Scores incoming transactions against running per-merchant and per-category
+statistics, so new imports can be checked without rescanning the history.
+Each transaction is scored and folded into the state in O(1):
+
+- Welford mean/variance of expense amounts per merchant and per category
+  (unusually large transactions)
+- the set of merchants seen so far and the category each was last filed
+  under (new merchants, category changes)
+- short- and long-horizon exponentially weighted spending rates per
+  category and over all spending (spending spikes)
+
+The state is saved as JSON between runs.
+"""
+
+import json
+import math
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+ALERT_COLUMNS = ['row', 'Transaction Date', 'Merchant', 'Category_Clean', 'Amount', 'alert', 'score']
+
+# Key of the spending rates over all categories
+ALL_CATEGORIES = '*'
+
+class StreamingAnomalyDetector:
+    """
+    Online anomaly detector over cleaned transaction data.
+
+    Expects the 'Transaction Date', 'Amount', 'Merchant' and
+    'Category_Clean' columns loaded by CustomFinancialAnalyzer.
+    """
+
+    def __init__(self, z_threshold=3.0, min_history=5, spike_ratio=3.0,
+                 short_horizon_days=3, long_horizon_days=60):
+        """
+        Args:
+            z_threshold: Standard deviations above the mean that make an amount unusually large
+            min_history: Transactions a merchant needs before its own statistics are used
+                (the category's are used until then)
+            spike_ratio: Short-horizon over long-horizon spending rate that counts as a spike
+            short_horizon_days: Time constant of the recent spending rate
+            long_horizon_days: Time constant of the baseline spending rate
+        """
+        self.z_threshold = z_threshold
+        self.min_history = min_history
+        self.spike_ratio = spike_ratio
+        self.short_horizon_days = short_horizon_days
+        self.long_horizon_days = long_horizon_days
+        self._reset()
+
+    def _reset(self):
+        # name -> [count, mean, M2] of expense amounts (positive)
+        self.merchant_stats = {}
+        self.category_stats = {}
+        # merchant -> category it was last seen with
+        self.merchant_categories = {}
+        # category (or ALL_CATEGORIES) -> [last day, short rate, long rate] in dollars per day
+        self.spending_rates = {}
+        self.transactions_seen = 0
+
+    def fit(self, data):
+        """
+        Build the state from a transaction history in one vectorized pass.
+
+        Replaces any existing state; use process() or process_batch() to add
+        transactions to a fitted detector.
+
+        Args:
+            data: Transaction DataFrame in date order
+
+        Returns:
+            StreamingAnomalyDetector: self
+        """
+        self._reset()
+        if data.empty:
+            return self
+        expenses = data[data['Amount'] < 0]
+        spend = -expenses['Amount']
+
+        for column, stats in (('Merchant', self.merchant_stats), ('Category_Clean', self.category_stats)):
+            grouped = spend.groupby(expenses[column].astype(object)).agg(['count', 'mean', 'var'])
+            grouped['m2'] = grouped['var'].fillna(0) * (grouped['count'] - 1)
+            for name, count, mean, m2 in zip(grouped.index, grouped['count'], grouped['mean'], grouped['m2']):
+                stats[name] = [int(count), float(mean), float(m2)]
+
+        latest = data.drop_duplicates('Merchant', keep='last')
+        self.merchant_categories.update(zip(latest['Merchant'].astype(object),
+                                            latest['Category_Clean'].astype(object)))
+
+        # Each expense contributes amount * exp(-age / horizon) / horizon to a rate
+        days = self._day_numbers(expenses['Transaction Date'])
+        last_day = float(self._day_numbers(data['Transaction Date']).max())
+        age = last_day - days
+        short = spend.to_numpy() * np.exp(-age / self.short_horizon_days) / self.short_horizon_days
+        long = spend.to_numpy() * np.exp(-age / self.long_horizon_days) / self.long_horizon_days
+        rates = pd.DataFrame({'short': short, 'long': long}, index=expenses.index)
+        by_category = rates.groupby(expenses['Category_Clean'].astype(object)).sum()
+        for category, row in by_category.iterrows():
+            self.spending_rates[category] = [last_day, float(row['short']), float(row['long'])]
+        self.spending_rates[ALL_CATEGORIES] = [last_day, float(short.sum()), float(long.sum())]
+
+        self.transactions_seen += len(data)
+        return self
+
+    def process(self, date, merchant, category, amount):
+        """
+        Score one transaction against the current state, then add it to the state.
+
+        Returns:
+            list: (alert, score) tuples, empty for a normal transaction
+        """
+        alerts = self.score(date, merchant, category, amount)
+        self.update(date, merchant, category, amount)
+        return alerts
+
+    def score(self, date, merchant, category, amount):
+        """
+        Alerts a transaction would raise, without changing the state.
+
+        Returns:
+            list: (alert, score) tuples. Scores are z-scores for
+            'large_amount', spending-rate ratios for 'spending_spike' (the
+            transaction's category) and 'overall_spending_spike' (all
+            categories together) and 1.0 for 'new_merchant' and
+            'category_change'
+        """
+        alerts = []
+        if self.transactions_seen == 0:
+            return alerts
+
+        if merchant not in self.merchant_categories:
+            alerts.append(('new_merchant', 1.0))
+        elif self.merchant_categories[merchant] != category:
+            alerts.append(('category_change', 1.0))
+
+        if amount < 0:
+            spend = -amount
+            stats = self.merchant_stats.get(merchant)
+            if stats is None or stats[0] < self.min_history:
+                stats = self.category_stats.get(category)
+            z = self._z_score(stats, spend)
+            if z is not None and z >= self.z_threshold:
+                alerts.append(('large_amount', z))
+
+            day = self._day_number(date)
+            # Rates built from a single charge are not a baseline yet
+            if self.category_stats.get(category, [0])[0] >= self.min_history:
+                ratio = self._spike_ratio(self.spending_rates.get(category), day, spend)
+                if ratio >= self.spike_ratio:
+                    alerts.append(('spending_spike', ratio))
+            if self.transactions_seen >= self.min_history:
+                ratio = self._spike_ratio(self.spending_rates.get(ALL_CATEGORIES), day, spend)
+                if ratio >= self.spike_ratio:
+                    alerts.append(('overall_spending_spike', ratio))
+        return alerts
+
+    def update(self, date, merchant, category, amount):
+        """Fold one transaction into the running statistics."""
+        self.merchant_categories[merchant] = category
+        self.transactions_seen += 1
+        if amount >= 0:
+            return
+
+        spend = -amount
+        for stats, key in ((self.merchant_stats, merchant), (self.category_stats, category)):
+            entry = stats.setdefault(key, [0, 0.0, 0.0])
+            entry[0] += 1
+            delta = spend - entry[1]
+            entry[1] += delta / entry[0]
+            entry[2] += delta * (spend - entry[1])
+
+        day = self._day_number(date)
+        for key in (category, ALL_CATEGORIES):
+            rate = self.spending_rates.setdefault(key, [day, 0.0, 0.0])
+            short, long = self._decayed(rate, day)
+            rate[:] = [max(day, rate[0]), short + spend / self.short_horizon_days,
+                       long + spend / self.long_horizon_days]
+
+    def process_batch(self, data):
+        """
+        Score and absorb a batch of new transactions in order.
+
+        Args:
+            data: Transaction DataFrame in date order
+
+        Returns:
+            pd.DataFrame: One row per alert (row is the index label of the transaction)
+        """
+        records = []
+        rows = zip(data.index, data['Transaction Date'], data['Merchant'], data['Category_Clean'], data['Amount'])
+        for row, date, merchant, category, amount in rows:
+            for alert, score in self.process(date, merchant, category, amount):
+                records.append((row, date, merchant, category, amount, alert, score))
+        return pd.DataFrame.from_records(records, columns=ALERT_COLUMNS)
+
+    def save(self, path):
+        """Write the detector state and settings as JSON."""
+        state = {
+            "settings": {
+                "z_threshold": self.z_threshold,
+                "min_history": self.min_history,
+                "spike_ratio": self.spike_ratio,
+                "short_horizon_days": self.short_horizon_days,
+                "long_horizon_days": self.long_horizon_days
+            },
+            "merchant_stats": self.merchant_stats,
+            "category_stats": self.category_stats,
+            "merchant_categories": self.merchant_categories,
+            "spending_rates": self.spending_rates,
+            "transactions_seen": self.transactions_seen
+        }
+        path = Path(path)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(state))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path):
+        """Restore a detector written by save()."""
+        state = json.loads(Path(path).read_text())
+        detector = cls(**state["settings"])
+        detector.merchant_stats = state["merchant_stats"]
+        detector.category_stats = state["category_stats"]
+        detector.merchant_categories = state["merchant_categories"]
+        detector.spending_rates = state["spending_rates"]
+        detector.transactions_seen = state["transactions_seen"]
+        return detector
+
+    @staticmethod
+    def _z_score(stats, value):
+        """Standard deviations of value above a Welford mean (None without enough history)."""
+        if stats is None or stats[0] < 2:
+            return None
+        # Floor the deviation so a merchant with identical past charges is not infinitely strict
+        std = max(math.sqrt(stats[2] / (stats[0] - 1)), 0.01 * abs(stats[1]), 0.01)
+        return (value - stats[1]) / std
+
+    def _spike_ratio(self, rate, day, spend):
+        """Short over long spending rate once spend is added at day (0.0 without a rate)."""
+        if rate is None:
+            return 0.0
+        short, long = self._decayed(rate, day)
+        short += spend / self.short_horizon_days
+        long += spend / self.long_horizon_days
+        return short / long if long > 0 else 0.0
+
+    def _decayed(self, rate, day):
+        """Short and long rates decayed from their last update to day."""
+        elapsed = max(day - rate[0], 0.0)
+        return (rate[1] * math.exp(-elapsed / self.short_horizon_days),
+                rate[2] * math.exp(-elapsed / self.long_horizon_days))
+
+    @staticmethod
+    def _day_number(date):
+        """Days since the epoch as a float."""
+        return pd.Timestamp(date).value / 86_400e9
+
+    @staticmethod
+    def _day_numbers(dates):
+        return pd.to_datetime(dates).to_numpy().astype('datetime64[ns]').astype(np.int64) / 86_400e9
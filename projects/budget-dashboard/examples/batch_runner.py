@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Multi-Account Batch Runner
+
+Runs every CustomFinancialAnalyzer analysis for each account in a combined
+transaction table on a process pool. Results are written as JSON Lines
+(one record per account) and per-account timings as a summary table.
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from custom_analysis import CustomFinancialAnalyzer, DEFAULT_REPORT_CONFIG
+from transaction_store import DEFAULT_CSV_PATH, TransactionStore
+
+DEFAULT_ACCOUNT_COLUMN = "Account"
+
+def analyze_partition(account, data, report_config=None):
+    """
+    Run the full custom report for one account.
+
+    Returns:
+        dict: Account id, row count, wall-clock seconds and either the
+        analysis results or the error that stopped them
+    """
+    start = time.perf_counter()
+    record = {"account": account, "rows": len(data)}
+    try:
+        analyzer = CustomFinancialAnalyzer(data.reset_index(drop=True))
+        record["results"] = analyzer.run_all_analyses(report_config)
+        record["status"] = "ok"
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["seconds"] = time.perf_counter() - start
+    return record
+
+def run_batch(data, output_dir, account_column=DEFAULT_ACCOUNT_COLUMN, jobs=1,
+              summary_format="json", report_config=None):
+    """
+    Partition transactions by account and analyze each partition.
+
+    Args:
+        data: Combined transactions with an account column
+        output_dir: Directory for results.jsonl and the summary file
+        account_column: Column identifying the account holder
+        jobs: Worker processes (1 runs in-process)
+        summary_format: 'json' or 'parquet' for the per-account timing summary
+        report_config: Analysis parameters (defaults to DEFAULT_REPORT_CONFIG)
+
+    Returns:
+        pd.DataFrame: Per-account summary (account, rows, status, seconds)
+    """
+    if summary_format not in ("json", "parquet"):
+        raise ValueError(f"Unsupported summary format: {summary_format}")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    config = report_config or DEFAULT_REPORT_CONFIG
+
+    # Largest partitions first so long tasks do not start last
+    partitions = sorted(data.groupby(account_column, sort=False, observed=True),
+                        key=lambda item: len(item[1]), reverse=True)
+
+    summary = []
+    with open(output_dir / "results.jsonl", "w") as results_file:
+        def write(record):
+            summary.append({key: record.get(key) for key in ("account", "rows", "status", "seconds", "error")})
+            results_file.write(json.dumps(_finite(record), default=_json_default, allow_nan=False) + "\n")
+
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = [pool.submit(analyze_partition, account, part, config) for account, part in partitions]
+                for future in as_completed(futures):
+                    write(future.result())
+        else:
+            for account, part in partitions:
+                write(analyze_partition(account, part, config))
+
+    summary = pd.DataFrame(summary)
+    if summary_format == "parquet":
+        summary.to_parquet(output_dir / "summary.parquet", index=False)
+    else:
+        summary.to_json(output_dir / "summary.json", orient="records", indent=2)
+    return summary
+
+def _finite(value):
+    """
+    Replace non-finite floats with None throughout a record.
+
+    Results contain inf (e.g. months_to_target without savings) and NaN,
+    which json.dumps would write as bare Infinity/NaN tokens that strict
+    JSON readers reject.
+    """
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    if isinstance(value, (float, np.floating)) and not np.isfinite(value):
+        return None
+    return value
+
+def _json_default(value):
+    """Serialize numpy and pandas values that json does not handle natively."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, pd.Period)):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the custom financial report for every account.")
+    parser.add_argument("--input", default=str(DEFAULT_CSV_PATH), help="Combined transactions CSV")
+    parser.add_argument("--account-column", default=DEFAULT_ACCOUNT_COLUMN, help="Column identifying the account")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes")
+    parser.add_argument("--output-dir", default="output/batch", help="Directory for results and summary")
+    parser.add_argument("--summary-format", choices=["json", "parquet"], default="json")
+    args = parser.parse_args()
+
+    data = TransactionStore(args.input).load()
+    print(f"Running custom analysis for {data[args.account_column].nunique():,} accounts...")
+    summary = run_batch(data, args.output_dir, args.account_column, args.jobs, args.summary_format)
+
+    failed = (summary["status"] != "ok").sum()
+    print(f"Done: {len(summary) - failed} succeeded, {failed} failed, "
+          f"{summary['seconds'].sum():.1f}s of analysis time")
+    print(f"Results written to {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,10 @@ This file demonstrates how to create custom analysis functions
 for specific financial insights beyond the standard dashboard.
 """
 
+import json
+import re
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
 from pathlib import Path
 import sys
 
@@ -17,14 +17,278 @@ import sys
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root / "scripts" / "analytics"))
 
-from budget_analyzer import BudgetAnalyzer
+from anomaly_detection import StreamingAnomalyDetector
+from duplicate_detection import DuplicateDetector
+from incremental_aggregates import MonthlyAggregateStore
+from merchant_standardization import MerchantStandardizer
+from recurring_charges import RecurringChargeDetector
+from savings_projection import SavingsProjector
+from transaction_store import DEFAULT_CSV_PATH, TransactionStore
+
+# Subscription types in priority order: a merchant matching several types
+# gets the first one. usage_hours is the estimated monthly usage.
+SUBSCRIPTION_TYPES = {
+    'streaming': {'keywords': ['netflix', 'spotify', 'disney', 'streaming'], 'usage_hours': 20},
+    'gym': {'keywords': ['gym', 'fitness', 'yoga'], 'usage_hours': 8},  # visits per month
+    'software': {'keywords': ['adobe', 'microsoft', 'software'], 'usage_hours': 40},
+    'cloud': {'keywords': ['cloud', 'storage', 'backup'], 'usage_hours': 24 * 30},  # always available
+}
+DEFAULT_USAGE_HOURS = 10
+
+# Parameters used by run_all_analyses() (the scenarios shown in example_custom_analysis)
+DEFAULT_REPORT_CONFIG = {
+    "debt_payoff": {"debt_amount": 15000, "monthly_payment": 500, "interest_rate": 0.18},
+    "emergency_fund": {"target_months": 6},
+    "spending_elasticity": {"category": "Food & Dining", "percentage_change": -0.2},
+    "subscription_roi": {"source": "base"},
+}
+
+# String columns that repeat across rows and are stored as categoricals by compact_data()
+COMPACT_COLUMNS = ['Merchant', 'Category_Clean', 'Bank', 'Description']
+
+class SubscriptionClassifier:
+    """
+    Labels subscription merchants by type with one compiled regex.
+
+    Each type becomes a lookahead alternative tried in priority order, so a
+    single pass over the merchant names reproduces first-match-wins keyword
+    rules. Unmatched merchants are labelled 'other'.
+    """
+    
+    def __init__(self, subscription_types=None, default_usage_hours=DEFAULT_USAGE_HOURS):
+        self.subscription_types = subscription_types or SUBSCRIPTION_TYPES
+        self.default_usage_hours = default_usage_hours
+        self.type_names = list(self.subscription_types)
+        
+        alternatives = [
+            f"(?=.*?(?P<t{i}>{'|'.join(re.escape(k.lower()) for k in spec['keywords'])}))"
+            for i, spec in enumerate(self.subscription_types.values())
+        ]
+        self.pattern = re.compile(f"^(?:{'|'.join(alternatives)})", re.IGNORECASE | re.DOTALL)
+    
+    @classmethod
+    def from_json(cls, path):
+        """Load subscription types from a JSON file shaped like SUBSCRIPTION_TYPES."""
+        with open(path) as f:
+            return cls(json.load(f))
+    
+    def classify(self, merchants):
+        """
+        Classify merchant names.
+        
+        Args:
+            merchants: Series of merchant names
+            
+        Returns:
+            pd.Series: Subscription type per merchant ('other' if none match)
+        """
+        matches = merchants.astype(str).str.extract(self.pattern)
+        matched = matches.notna().to_numpy()
+        labels = np.array(self.type_names + ['other'], dtype=object)
+        first = np.where(matched.any(axis=1), matched.argmax(axis=1), len(self.type_names))
+        return pd.Series(labels[first], index=merchants.index)
+    
+    def usage_hours(self, types):
+        """Estimated monthly usage hours for each subscription type."""
+        hours = {name: spec['usage_hours'] for name, spec in self.subscription_types.items()}
+        return types.map(hours).fillna(self.default_usage_hours)
 
 class CustomFinancialAnalyzer:
     """Extended analyzer with custom financial insights."""
     
     def __init__(self, data=None):
+        # Imported here so importing this module does not load the base
+        # analyzer (and its plotting stack) until an analyzer is created
+        from budget_analyzer import BudgetAnalyzer
+        
         self.base_analyzer = BudgetAnalyzer(data)
-        self.data = self.base_analyzer.data
+        self.subscription_classifier = SubscriptionClassifier()
+        
+        # Base aggregates are cached per data version; see invalidate_cache()
+        self._data_version = 0
+        self._result_cache = {}
+        self.cache_stats = {"hits": 0, "misses": 0}
+        
+        # Running month x category totals, created by append_transactions()
+        self.aggregates = None
+    
+    @classmethod
+    def from_store(cls, csv_path=DEFAULT_CSV_PATH, columns=None, start_date=None, end_date=None):
+        """
+        Create an analyzer from the columnar cache of the cleaned transactions CSV.
+        
+        Args:
+            csv_path: Cleaned transactions CSV backing the cache
+            columns: Columns to load (all if None)
+            start_date: First date to include
+            end_date: Last date to include
+        """
+        data = TransactionStore(csv_path).load(columns, start_date, end_date)
+        return cls(data)
+    
+    @property
+    def data(self):
+        """Transaction data shared with the base analyzer."""
+        return self.base_analyzer.data
+    
+    @data.setter
+    def data(self, data):
+        self.base_analyzer.data = data
+        self.aggregates = None
+        self.invalidate_cache()
+    
+    def append_transactions(self, new_rows):
+        """
+        Append a batch of transactions and update the running aggregates.
+        
+        The first call builds a MonthlyAggregateStore from the existing data;
+        later calls only fold the new rows into it. Once the store exists,
+        monthly and category results are read from it instead of being
+        recomputed from the full history.
+        
+        self.data itself is still rebuilt with one concatenation, which
+        copies the full history (O(total rows) per call), so append whole
+        import batches rather than a few rows at a time. Columns made
+        categorical by compact_data() stay categorical: the batch is cast to
+        their dtype, with any new values added to the categories.
+        
+        Args:
+            new_rows: DataFrame with the same columns as self.data
+        """
+        if self.aggregates is None:
+            self.aggregates = MonthlyAggregateStore(self.data)
+        self.aggregates.update(new_rows)
+        
+        data = self.data.copy(deep=False)
+        new_rows = new_rows.copy(deep=False)
+        for column in data.columns.intersection(new_rows.columns):
+            dtype = data[column].dtype
+            if not isinstance(dtype, pd.CategoricalDtype):
+                continue
+            new_values = pd.Index(new_rows[column].dropna().unique(), dtype=object)
+            missing = new_values.difference(dtype.categories)
+            if len(missing):
+                data[column] = data[column].cat.add_categories(missing)
+            new_rows[column] = new_rows[column].astype(data[column].dtype)
+        
+        self.base_analyzer.data = pd.concat([data, new_rows], ignore_index=True)
+        self.invalidate_cache()
+    
+    def compact_data(self):
+        """
+        Convert repeated string columns of self.data to categoricals.
+        
+        Merchant, category, bank and description strings repeat across
+        rows, so dictionary encoding shrinks resident memory several-fold
+        on long histories. Amounts stay float dollars because the base
+        analyzer's aggregates consume them directly.
+        
+        Returns:
+            pd.Series: Memory report (bytes per column) after compaction
+        """
+        data = self.data.copy()
+        for column in COMPACT_COLUMNS:
+            if column in data.columns and not isinstance(data[column].dtype, pd.CategoricalDtype):
+                data[column] = data[column].astype('category')
+        self.data = data
+        return self.memory_report()
+    
+    def standardize_merchants(self, standardizer=None, source_column='Merchant'):
+        """
+        Replace the Merchant column with standardized merchant names.
+        
+        Every grouping by merchant (subscription ROI, recurring charges,
+        duplicate and anomaly detection) then sees one name per merchant.
+        
+        Args:
+            standardizer: MerchantStandardizer to use (defaults to the built-in rules)
+            source_column: Column holding the raw descriptors ('Merchant' or 'Description')
+            
+        Returns:
+            pd.Series: Number of rows per standardized merchant
+        """
+        standardizer = standardizer or MerchantStandardizer()
+        data = self.data.copy()
+        data['Merchant'] = standardizer.standardize(data[source_column])
+        self.data = data
+        return data['Merchant'].value_counts()
+    
+    def memory_report(self):
+        """Resident memory of self.data in bytes per column, plus a 'total' entry."""
+        usage = self.data.memory_usage(deep=True, index=False)
+        usage['total'] = usage.sum()
+        return usage
+    
+    def invalidate_cache(self):
+        """
+        Drop cached base results.
+        
+        Called automatically when self.data is replaced; call it explicitly
+        after modifying self.data in place.
+        """
+        self._data_version += 1
+        self._result_cache.clear()
+    
+    def _cached(self, name, compute):
+        """Return a cached result for the current data version, computing it on a miss."""
+        key = (name, self._data_version)
+        if key in self._result_cache:
+            self.cache_stats["hits"] += 1
+        else:
+            self.cache_stats["misses"] += 1
+            self._result_cache[key] = compute()
+        return self._result_cache[key]
+    
+    def _calendar_index(self):
+        """
+        Integer calendar fields for self.data, built once per data version.
+        
+        Returns:
+            dict: Row-aligned arrays ``day_of_week`` (0 = Monday) and
+            ``is_weekend``, plus the number of distinct ``weekday_days``
+            and ``weekend_days`` in the data
+        """
+        return self._cached("calendar_index", self._build_calendar_index)
+    
+    def _build_calendar_index(self):
+        dates = pd.to_datetime(self.data['Transaction Date'])
+        if dates.dt.tz is not None:
+            # Bucket by local wall-clock day, as dt.day_name() does, not by UTC day
+            dates = dates.dt.tz_localize(None)
+        day_number = dates.to_numpy().astype('datetime64[D]').astype(np.int64)
+        
+        # Day 0 (1970-01-01) was a Thursday
+        day_of_week = ((day_number + 3) % 7).astype(np.int8)
+        unique_days = np.unique(day_number)
+        weekend_days = int((((unique_days + 3) % 7) >= 5).sum())
+        
+        return {
+            "day_of_week": day_of_week,
+            "is_weekend": day_of_week >= 5,
+            "weekday_days": len(unique_days) - weekend_days,
+            "weekend_days": weekend_days
+        }
+    
+    def _monthly_analysis(self):
+        source = self.aggregates if self.aggregates is not None else self.base_analyzer
+        return self._cached("monthly_analysis", source.monthly_analysis)
+    
+    def _category_analysis(self):
+        source = self.aggregates if self.aggregates is not None else self.base_analyzer
+        return self._cached("category_analysis", source.category_analysis)
+    
+    def _monthly_subscriptions(self):
+        return self._cached("monthly_subscriptions", self.base_analyzer.analyze_monthly_subscriptions)
+    
+    def detect_recurring_charges(self):
+        """
+        Recurring charges found from charge timing (see RecurringChargeDetector).
+        
+        Returns:
+            pd.DataFrame: Recurring merchants with Merchant and Avg_Amount
+            (monthly-equivalent cost) plus cadence and confidence details
+        """
+        return self._cached("recurring_charges", lambda: RecurringChargeDetector().detect(self.data))
     
     def analyze_debt_payoff_simulation(self, debt_amount, monthly_payment, interest_rate):
         """
@@ -38,34 +302,98 @@ class CustomFinancialAnalyzer:
         Returns:
             dict: Payoff analysis including timeline and total interest
         """
-        monthly_rate = interest_rate / 12
-        
-        # Calculate payoff timeline
-        if monthly_payment <= debt_amount * monthly_rate:
+        if monthly_payment <= debt_amount * interest_rate / 12:
             return {"error": "Payment too small - debt will never be paid off"}
         
-        months = 0
-        remaining = debt_amount
-        total_interest = 0
+        batch = self.analyze_debt_payoff_batch(debt_amount, monthly_payment, interest_rate)
+        result = {key: values[0].item() for key, values in batch.items()}
+        # Keep the scalar contract: whole months, and the payment exactly as passed in
+        result["months_to_payoff"] = int(result["months_to_payoff"])
+        result["monthly_payment_amount"] = monthly_payment
+        return result
+    
+    def analyze_debt_payoff_batch(self, debt_amounts, monthly_payments, interest_rates,
+                                  include_schedule=False, max_schedule_months=600):
+        """
+        Closed-form debt payoff for many scenarios at once.
+        
+        Inputs broadcast against each other, so a scalar debt can be swept
+        over arrays of payments and rates. Scenarios whose payment does not
+        cover the first month's interest get infinite months and NaN totals.
         
-        while remaining > 0:
-            interest_charge = remaining * monthly_rate
-            principal_payment = min(monthly_payment - interest_charge, remaining)
+        Args:
+            debt_amounts: Debt amount(s)
+            monthly_payments: Monthly payment(s)
+            interest_rates: Annual interest rate(s) (as decimal)
+            include_schedule: Also return the month-by-month amortization schedule
+            max_schedule_months: Number of months covered by the schedule
             
-            total_interest += interest_charge
-            remaining -= principal_payment
-            months += 1
+        Returns:
+            dict: Flat arrays (one entry per scenario) of months_to_payoff,
+            years_to_payoff, total_interest_paid, total_amount_paid and
+            monthly_payment_amount. With include_schedule, "schedule" is an
+            array of shape (scenarios, max_schedule_months, 3) holding payment,
+            interest and remaining balance per month (zero after payoff).
+        """
+        principal, payment, annual_rate = np.broadcast_arrays(
+            *(np.asarray(x, dtype=float) for x in (debt_amounts, monthly_payments, interest_rates))
+        )
+        principal, payment, annual_rate = principal.ravel(), payment.ravel(), annual_rate.ravel()
+        rate = annual_rate / 12
+        feasible = payment > principal * rate
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # n = -ln(1 - rP/A) / ln(1 + r), or P/A when the rate is zero
+            exact_months = np.where(
+                rate > 0,
+                -np.log1p(-rate * principal / payment) / np.log1p(rate),
+                principal / payment
+            )
+            # Tolerance keeps exact payoffs from rounding up an extra month
+            months = np.where(feasible, np.ceil(exact_months - 1e-9), np.inf)
             
-            if months > 600:  # Safety check for 50 years
-                break
+            # Final payment clears the balance left after months - 1 payments
+            final_payment = self._remaining_balance(principal, payment, rate, months - 1) * (1 + rate)
+            total_paid = np.where(feasible, payment * (months - 1) + final_payment, np.nan)
         
-        return {
+        results = {
             "months_to_payoff": months,
             "years_to_payoff": months / 12,
-            "total_interest_paid": total_interest,
-            "total_amount_paid": debt_amount + total_interest,
-            "monthly_payment_amount": monthly_payment
+            "total_interest_paid": total_paid - principal,
+            "total_amount_paid": total_paid,
+            "monthly_payment_amount": payment
         }
+        
+        if include_schedule:
+            results["schedule"] = self._amortization_schedule(
+                principal, payment, rate, months, max_schedule_months
+            )
+        
+        return results
+    
+    @staticmethod
+    def _remaining_balance(principal, payment, rate, months):
+        """Balance after a number of full payments: P(1+r)^k - A((1+r)^k - 1)/r."""
+        growth = np.power(1 + rate, months)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            annuity = np.where(rate > 0, (growth - 1) / rate, months)
+        return principal * growth - payment * annuity
+    
+    def _amortization_schedule(self, principal, payment, rate, months, max_months):
+        """Build the (scenarios, months, [payment, interest, balance]) schedule array."""
+        k = np.arange(1, max_months + 1)
+        opening = np.clip(
+            self._remaining_balance(principal[:, None], payment[:, None], rate[:, None], k - 1), 0, None
+        )
+        active = k <= months[:, None]
+        
+        interest = np.where(active, opening * rate[:, None], 0.0)
+        paid = np.where(active, np.minimum(payment[:, None], opening + interest), 0.0)
+        balance = np.where(active, opening + interest - paid, 0.0)
+        
+        schedule = np.stack([paid, interest, balance], axis=-1)
+        schedule[~np.isfinite(months)] = np.nan
+        return schedule
     
     def analyze_emergency_fund_adequacy(self, target_months=6):
         """
@@ -77,7 +405,7 @@ class CustomFinancialAnalyzer:
         Returns:
             dict: Emergency fund analysis
         """
-        monthly_analysis = self.base_analyzer.monthly_analysis()
+        monthly_analysis = self._monthly_analysis()
         
         if monthly_analysis.empty:
             return {"error": "No monthly data available"}
@@ -101,6 +429,50 @@ class CustomFinancialAnalyzer:
             "current_savings_adequate": avg_monthly_savings > 0 and months_to_target <= 24
         }
     
+    def analyze_emergency_fund_projection(self, target_months=6, starting_balance=0.0, horizon_months=120,
+                                          n_paths=100_000, seed=None):
+        """
+        Monte Carlo projection of the time to build an emergency fund.
+        
+        Unlike analyze_emergency_fund_adequacy, which divides the target by
+        the mean monthly savings, this bootstraps the monthly Net_Amount
+        history, so volatile or slightly negative savings still give a
+        probability of reaching the target (see SavingsProjector).
+        
+        Args:
+            target_months: Target months of expenses to save
+            starting_balance: Savings already set aside
+            horizon_months: Months to simulate
+            n_paths: Simulated paths
+            seed: Random seed for reproducible results
+            
+        Returns:
+            dict: Target, probability of reaching it within the horizon,
+            percentile bands of the months needed and the probability of
+            having reached it by each year
+        """
+        monthly_analysis = self._monthly_analysis()
+        
+        if monthly_analysis.empty:
+            return {"error": "No monthly data available"}
+        
+        target = abs(monthly_analysis["Total_Expenses"].mean()) * target_months
+        projector = SavingsProjector(horizon_months=horizon_months, n_paths=n_paths, seed=seed)
+        result, curves = projector.project([monthly_analysis["Net_Amount"].to_numpy()], target,
+                                           starting_balance, return_curves=True)
+        row = result.iloc[0]
+        
+        return {
+            "target_emergency_fund": target,
+            "average_monthly_savings": row["mean_monthly_savings"],
+            "probability_of_reaching": row["probability_of_reaching"],
+            "months_to_target_percentiles": {p: row[f"months_p{p}"] for p in projector.percentiles},
+            "probability_by_year": {year: curves.iloc[0, year * 12]
+                                    for year in range(1, horizon_months // 12 + 1)},
+            "horizon_months": horizon_months,
+            "n_paths": n_paths
+        }
+    
     def analyze_spending_elasticity(self, category, percentage_change):
         """
         Analyze impact of changing spending in one category.
@@ -112,38 +484,71 @@ class CustomFinancialAnalyzer:
         Returns:
             dict: Impact analysis
         """
-        category_analysis = self.base_analyzer.category_analysis()
-        
-        if category not in category_analysis.index:
+        if category not in self._category_analysis().index:
             return {"error": f"Category '{category}' not found"}
         
-        current_spending = abs(category_analysis.loc[category, "Expense_Amount"])
-        spending_change = current_spending * percentage_change
+        row = self.analyze_spending_elasticity_batch([category], [percentage_change]).iloc[0]
+        return {
+            "category": category,
+            "current_monthly_spending": row["current_monthly_spending"],
+            "monthly_spending_change": row["monthly_spending_change"],
+            "annual_spending_change": row["annual_spending_change"],
+            "current_monthly_savings": row["current_monthly_savings"],
+            "new_monthly_savings": row["new_monthly_savings"],
+            "compound_savings_1_year": row["compound_savings_12m"],
+            "compound_savings_5_years": row["compound_savings_60m"],
+            "compound_savings_10_years": row["compound_savings_120m"]
+        }
+    
+    def analyze_spending_elasticity_batch(self, categories, percentage_changes,
+                                          horizons=(12, 60, 120), annual_return=0.07):
+        """
+        Analyze every category x percentage change scenario in one call.
         
-        monthly_analysis = self.base_analyzer.monthly_analysis()
+        Args:
+            categories: Categories to modify (unknown categories are skipped)
+            percentage_changes: Percentage changes to apply (e.g., -0.2 for 20% reduction)
+            horizons: Horizons in months for the compound savings columns
+            annual_return: Annual return used to compound the monthly change
+            
+        Returns:
+            pd.DataFrame: One row per (category, percentage_change) with the
+            same figures as analyze_spending_elasticity and one
+            compound_savings_<N>m column per horizon
+        """
+        category_analysis = self._category_analysis()
+        monthly_analysis = self._monthly_analysis()
+        n_months = len(monthly_analysis)
         avg_monthly_savings = monthly_analysis["Net_Amount"].mean()
-        new_monthly_savings = avg_monthly_savings - spending_change
-        
-        # Calculate compound impact over time
-        def compound_savings(monthly_amount, months, annual_return=0.07):
-            monthly_return = annual_return / 12
-            return monthly_amount * (((1 + monthly_return) ** months - 1) / monthly_return)
         
-        savings_1_year = compound_savings(-spending_change, 12)
-        savings_5_years = compound_savings(-spending_change, 60)
-        savings_10_years = compound_savings(-spending_change, 120)
-        
-        return {
-            "category": category,
-            "current_monthly_spending": current_spending / len(monthly_analysis),
-            "monthly_spending_change": spending_change / len(monthly_analysis),
+        categories = [c for c in categories if c in category_analysis.index]
+        current_spending = category_analysis.loc[categories, "Expense_Amount"].abs().to_numpy()
+        pct = np.asarray(percentage_changes, dtype=float)
+        
+        # (categories, changes) grid flattened to one row per scenario
+        spending_change = (current_spending[:, None] * pct[None, :]).ravel()
+        results = pd.DataFrame({
+            "category": np.repeat(categories, len(pct)),
+            "percentage_change": np.tile(pct, len(categories)),
+            "current_monthly_spending": np.repeat(current_spending / n_months, len(pct)),
+            "monthly_spending_change": spending_change / n_months,
             "annual_spending_change": spending_change,
             "current_monthly_savings": avg_monthly_savings,
-            "new_monthly_savings": new_monthly_savings,
-            "compound_savings_1_year": savings_1_year,
-            "compound_savings_5_years": savings_5_years,
-            "compound_savings_10_years": savings_10_years
-        }
+            "new_monthly_savings": avg_monthly_savings - spending_change
+        })
+        
+        # Future value of a monthly contribution, broadcast over (scenarios, horizons)
+        months = np.asarray(horizons, dtype=float)
+        monthly_return = annual_return / 12
+        if monthly_return:
+            growth = ((1 + monthly_return) ** months - 1) / monthly_return
+        else:
+            growth = months
+        compound = -spending_change[:, None] * growth[None, :]
+        for i, horizon in enumerate(horizons):
+            results[f"compound_savings_{horizon}m"] = compound[:, i]
+        
+        return results
     
     def analyze_weekend_vs_weekday_patterns(self):
         """
@@ -155,25 +560,23 @@ class CustomFinancialAnalyzer:
         if self.data.empty:
             return {"error": "No data available"}
         
-        # Ensure we have day of week data
-        if 'Day_of_Week' not in self.data.columns:
-            self.data['Day_of_Week'] = pd.to_datetime(self.data['Transaction Date']).dt.day_name()
+        calendar = self._calendar_index()
         
-        # Categorize as weekend/weekday
-        weekend_days = ['Saturday', 'Sunday']
-        weekday_data = self.data[~self.data['Day_of_Week'].isin(weekend_days)]
-        weekend_data = self.data[self.data['Day_of_Week'].isin(weekend_days)]
+        # Expense totals per (category, weekend flag) cell in one integer-code pass
+        amount = self.data['Amount'].to_numpy(dtype=float)
+        codes, categories = pd.factorize(self.data['Category_Clean'])
+        rows = (amount < 0) & (codes >= 0)
+        cells = codes[rows] * 2 + calendar['is_weekend'][rows]
+        totals = np.bincount(cells, weights=-amount[rows], minlength=2 * len(categories)).reshape(-1, 2)
+        present = np.bincount(cells, minlength=2 * len(categories)).reshape(-1, 2) > 0
         
         # Calculate spending by category for each
-        weekday_spending = weekday_data[weekday_data['Amount'] < 0].groupby('Category_Clean')['Amount'].sum().abs()
-        weekend_spending = weekend_data[weekend_data['Amount'] < 0].groupby('Category_Clean')['Amount'].sum().abs()
+        weekday_spending = pd.Series(totals[present[:, 0], 0], index=categories[present[:, 0]])
+        weekend_spending = pd.Series(totals[present[:, 1], 1], index=categories[present[:, 1]])
         
         # Calculate daily averages (accounting for different number of days)
-        total_weekdays = len(weekday_data['Transaction Date'].dt.date.unique())
-        total_weekends = len(weekend_data['Transaction Date'].dt.date.unique())
-        
-        weekday_daily_avg = weekday_spending / max(total_weekdays, 1)
-        weekend_daily_avg = weekend_spending / max(total_weekends, 1)
+        weekday_daily_avg = weekday_spending / max(calendar['weekday_days'], 1)
+        weekend_daily_avg = weekend_spending / max(calendar['weekend_days'], 1)
         
         # Find categories with biggest weekend differences
         comparison = pd.DataFrame({
@@ -194,57 +597,41 @@ class CustomFinancialAnalyzer:
             "biggest_weekend_categories": comparison.nlargest(5, 'weekend_premium').index.tolist()
         }
     
-    def analyze_subscription_roi(self):
+    def analyze_subscription_roi(self, source="base"):
         """
         Analyze return on investment for subscription services.
         
+        Args:
+            source: 'base' for BudgetAnalyzer.analyze_monthly_subscriptions(),
+                'recurring' for charges detected by detect_recurring_charges()
+        
         Returns:
             dict: Subscription ROI analysis
         """
         # Get subscription data
-        subscription_data = self.base_analyzer.analyze_monthly_subscriptions()
+        if source == "recurring":
+            subscription_data = self.detect_recurring_charges()
+        elif source == "base":
+            subscription_data = self._monthly_subscriptions()
+        else:
+            raise ValueError(f"Unknown subscription source: {source}")
         
         if subscription_data.empty:
             return {"error": "No subscription data found"}
         
-        # Estimate usage and value
-        roi_analysis = {}
+        # Estimate usage and value (could be enhanced with actual usage data)
+        roi = subscription_data[['Merchant', 'Avg_Amount']].rename(columns={'Avg_Amount': 'monthly_cost'})
+        roi['category'] = self.subscription_classifier.classify(roi['Merchant'])
+        roi['estimated_usage_hours'] = self.subscription_classifier.usage_hours(roi['category'])
+        roi['cost_per_hour'] = roi['monthly_cost'] / roi['estimated_usage_hours']
+        roi['annual_cost'] = roi['monthly_cost'] * 12
+        roi['value_rating'] = np.select(
+            [roi['cost_per_hour'] < 2, roi['cost_per_hour'] < 5], ['high', 'medium'], default='low'
+        )
         
-        for idx, sub in subscription_data.iterrows():
-            merchant = sub['Merchant']
-            monthly_cost = sub['Avg_Amount']
-            
-            # Basic ROI estimates (could be enhanced with actual usage data)
-            estimated_usage_hours = {
-                'streaming': 20,  # hours per month
-                'gym': 8,         # visits per month  
-                'software': 40,   # hours per month
-                'cloud': 24*30,   # hours per month (always available)
-            }
-            
-            # Categorize subscription type
-            if any(term in merchant.lower() for term in ['netflix', 'spotify', 'disney', 'streaming']):
-                category = 'streaming'
-            elif any(term in merchant.lower() for term in ['gym', 'fitness', 'yoga']):
-                category = 'gym'
-            elif any(term in merchant.lower() for term in ['adobe', 'microsoft', 'software']):
-                category = 'software'
-            elif any(term in merchant.lower() for term in ['cloud', 'storage', 'backup']):
-                category = 'cloud'
-            else:
-                category = 'other'
-            
-            usage_hours = estimated_usage_hours.get(category, 10)
-            cost_per_hour = monthly_cost / usage_hours
-            
-            roi_analysis[merchant] = {
-                'monthly_cost': monthly_cost,
-                'category': category,
-                'estimated_usage_hours': usage_hours,
-                'cost_per_hour': cost_per_hour,
-                'annual_cost': monthly_cost * 12,
-                'value_rating': 'high' if cost_per_hour < 2 else 'medium' if cost_per_hour < 5 else 'low'
-            }
+        roi_analysis = (roi.drop_duplicates('Merchant', keep='last')
+                        .set_index('Merchant')
+                        .to_dict('index'))
         
         return {
             "total_monthly_subscriptions": subscription_data['Avg_Amount'].sum(),
@@ -254,6 +641,58 @@ class CustomFinancialAnalyzer:
             "optimization_suggestions": self._get_subscription_optimization_suggestions(roi_analysis)
         }
     
+    def find_duplicate_transactions(self, methods=('exact', 'similar', 'transfer'), **detector_options):
+        """
+        Find candidate duplicate and transfer pairs in the loaded transactions.
+        
+        Args:
+            methods: Detection methods to run ('exact', 'similar', 'transfer')
+            detector_options: DuplicateDetector settings (window_days, min_similarity, ...)
+            
+        Returns:
+            pd.DataFrame: Candidate pairs with scores (see DuplicateDetector.find_duplicates)
+        """
+        return DuplicateDetector(**detector_options).find_duplicates(self.data, methods)
+    
+    def anomaly_detector(self, state_path=None, **detector_options):
+        """
+        Streaming anomaly detector for scoring newly imported transactions.
+        
+        The detector is restored from state_path when that file exists;
+        otherwise it is fitted on self.data. Save it again with
+        detector.save(state_path) after processing a batch.
+        
+        Args:
+            state_path: JSON state written by StreamingAnomalyDetector.save()
+            detector_options: StreamingAnomalyDetector settings for a new detector
+            
+        Returns:
+            StreamingAnomalyDetector: Detector ready for process_batch()
+        """
+        if state_path is not None and Path(state_path).exists():
+            return StreamingAnomalyDetector.load(state_path)
+        history = self.data.sort_values('Transaction Date', kind='stable')
+        return StreamingAnomalyDetector(**detector_options).fit(history)
+    
+    def run_all_analyses(self, report_config=None):
+        """
+        Run every custom analysis and collect the results.
+        
+        Args:
+            report_config: Parameters per analysis (defaults to DEFAULT_REPORT_CONFIG)
+            
+        Returns:
+            dict: Result of each analysis keyed by name
+        """
+        config = report_config or DEFAULT_REPORT_CONFIG
+        return {
+            "debt_payoff": self.analyze_debt_payoff_simulation(**config["debt_payoff"]),
+            "emergency_fund": self.analyze_emergency_fund_adequacy(**config["emergency_fund"]),
+            "spending_elasticity": self.analyze_spending_elasticity(**config["spending_elasticity"]),
+            "weekend_patterns": self.analyze_weekend_vs_weekday_patterns(),
+            "subscription_roi": self.analyze_subscription_roi(**config.get("subscription_roi", {}))
+        }
+    
     def _get_subscription_optimization_suggestions(self, roi_analysis):
         """Generate subscription optimization suggestions."""
         suggestions = []
@@ -369,6 +808,9 @@ def example_custom_analysis():
         for suggestion in subscription_roi['optimization_suggestions'][:3]:
             print(f"  • {suggestion}")
     
+    print(f"\nBase results cache: {analyzer.cache_stats['hits']} hits, "
+          f"{analyzer.cache_stats['misses']} misses")
+    
     print("\n" + "="*60)
     print("CUSTOM ANALYSIS COMPLETE")
     print("="*60)
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Duplicate Transaction Detection
+
+Finds likely duplicate transactions in combined bank exports without
+comparing every pair of rows. Rows are blocked on their amount in cents and
+sorted by date inside each block, so each row is only compared with its
+next few neighbours within a time window. Descriptions are compared through
+hashed character-shingle signatures.
+
+Detection methods (as documented in analysis-features.md):
+- exact: same amount, date and merchant
+- similar: same amount and similar description within a time window
+- transfer: opposite amounts on different accounts within a time window
+"""
+
+import pandas as pd
+import numpy as np
+
+PAIR_COLUMNS = ['left', 'right', 'method', 'days_apart', 'similarity', 'score']
+
+# Width of a description signature in 64-bit words
+SIGNATURE_WORDS = 2
+
+def _popcount(words):
+    """Number of set bits in each element of a uint64 array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    as_bytes = words.view(np.uint8).reshape(*words.shape, 8)
+    return np.unpackbits(as_bytes, axis=-1).sum(axis=-1)
+
+def shingle_signatures(texts, shingle_size=3, max_length=48, chunk_size=100_000):
+    """
+    Hash each text's character shingles into a fixed-width bit signature.
+
+    The Jaccard similarity of two signatures approximates the Jaccard
+    similarity of the texts' shingle sets, at the cost of a few bitwise
+    operations per pair. Texts are hashed as case-folded code point
+    matrices, chunk_size texts at a time.
+
+    Args:
+        texts: Sequence of strings (typically the unique descriptions)
+        shingle_size: Characters per shingle
+        max_length: Characters of each text that are hashed
+
+    Returns:
+        np.ndarray: uint64 array of shape (len(texts), SIGNATURE_WORDS)
+    """
+    encoded = np.asarray(texts, dtype=object).astype(str)
+    width = max(encoded.dtype.itemsize // 4, shingle_size)
+    if width > max_length:
+        encoded, width = encoded.astype(f'U{max_length}'), max_length
+    elif width > encoded.dtype.itemsize // 4:
+        encoded = encoded.astype(f'U{width}')
+    # Position of each shingle's bit: the top bits of a multiplicative hash
+    shift = np.uint64(64 - int(np.log2(SIGNATURE_WORDS * 64)))
+    n_shingles = width - shingle_size + 1
+
+    signatures = np.zeros((len(encoded), SIGNATURE_WORDS), dtype=np.uint64)
+    for lo in range(0, len(encoded), chunk_size):
+        chunk = encoded[lo:lo + chunk_size]
+        chars = chunk.view(np.uint32).reshape(len(chunk), width).astype(np.uint64)
+        chars += ((chars >= ord('A')) & (chars <= ord('Z'))) * np.uint64(32)
+        hashes = np.zeros((len(chunk), n_shingles), dtype=np.uint64)
+        for k in range(shingle_size):
+            hashes = hashes * np.uint64(0x10FFFF) + chars[:, k:k + n_shingles]
+        bits = (hashes * np.uint64(0x9E3779B97F4A7C15)) >> shift
+
+        # Texts shorter than a shingle still get one (zero-padded) shingle
+        lengths = (chars != 0).sum(axis=1)
+        valid = np.arange(n_shingles) <= np.maximum(lengths - shingle_size, 0)[:, None]
+        masks = np.uint64(1) << (bits & np.uint64(63))
+        words = bits >> np.uint64(6)
+        for word in range(SIGNATURE_WORDS):
+            selected = np.where(valid & (words == word), masks, np.uint64(0))
+            signatures[lo:lo + len(chunk), word] = np.bitwise_or.reduce(selected, axis=1)
+    return signatures
+
+def signature_similarity(left, right):
+    """Row-wise Jaccard similarity of two signature arrays."""
+    shared = np.zeros(len(left), dtype=np.int64)
+    union = np.zeros(len(left), dtype=np.int64)
+    for word in range(left.shape[1]):
+        shared += _popcount(left[:, word] & right[:, word])
+        union += _popcount(left[:, word] | right[:, word])
+    # Every text sets at least one bit, so the union is only empty for no pairs
+    return shared / np.maximum(union, 1)
+
+def sort_order(*keys):
+    """
+    Row order sorted by the given integer keys, the first key most significant.
+
+    Keys are packed into one int64 when their ranges fit, which sorts several
+    times faster than np.lexsort on millions of rows.
+    """
+    packed = np.zeros(len(keys[0]), dtype=np.int64)
+    capacity = 1
+    for key in keys:
+        low, span = key.min(), int(key.max() - key.min()) + 1
+        capacity *= span
+        if capacity >= 2 ** 62:
+            return np.lexsort(keys[::-1])
+        packed = packed * span + (key - low)
+    return np.argsort(packed)
+
+class _DescriptionSignatures:
+    """Shingle signatures of the distinct descriptions, built on first use."""
+
+    def __init__(self, descriptions):
+        self.codes, self.uniques = pd.factorize(descriptions.astype(str))
+        self.signatures = np.zeros((len(self.uniques), SIGNATURE_WORDS), dtype=np.uint64)
+        self.built = np.zeros(len(self.uniques), dtype=bool)
+
+    def similarity(self, left, right):
+        """Shingle similarity of the descriptions of paired rows (by position)."""
+        left, right = self.codes[left], self.codes[right]
+        if len(left) >= len(self.uniques):
+            # Cheaper to build every signature than to find the ones in use
+            missing = ~self.built
+        else:
+            missing = np.zeros(len(self.uniques), dtype=bool)
+            missing[left] = True
+            missing[right] = True
+            missing &= ~self.built
+        if missing.any():
+            self.signatures[missing] = shingle_signatures(self.uniques[missing])
+            self.built |= missing
+        return signature_similarity(self.signatures[left], self.signatures[right])
+
+class DuplicateDetector:
+    """
+    Sort-and-window duplicate detector over cleaned transaction data.
+
+    Expects the 'Transaction Date', 'Amount', 'Merchant' and 'Description'
+    columns loaded by CustomFinancialAnalyzer, plus an account column for
+    transfer matching.
+    """
+
+    def __init__(self, window_days=3, transfer_window_days=3, min_similarity=0.6,
+                 max_neighbors=8, account_column='Bank'):
+        """
+        Args:
+            window_days: Maximum days between similar-description duplicates
+            transfer_window_days: Maximum days between the two legs of a transfer
+            min_similarity: Minimum description similarity for 'similar' pairs
+            max_neighbors: Rows ahead of each row (within its amount block) to compare
+            account_column: Column identifying the account for transfer matching
+        """
+        self.window_days = window_days
+        self.transfer_window_days = transfer_window_days
+        self.min_similarity = min_similarity
+        self.max_neighbors = max_neighbors
+        self.account_column = account_column
+
+    def find_duplicates(self, data, methods=('exact', 'similar', 'transfer')):
+        """
+        Find candidate duplicate pairs.
+
+        Args:
+            data: Transaction DataFrame
+            methods: Detection methods to run
+
+        Returns:
+            pd.DataFrame: One row per candidate pair with the index labels of
+            both rows ('left' is the earlier one), the method, days_apart,
+            description similarity and a score in [0, 1], highest score first
+        """
+        if data.empty:
+            return pd.DataFrame(columns=PAIR_COLUMNS)
+
+        amount = data['Amount'].to_numpy(dtype=float)
+        cents = np.round(amount * 100).astype(np.int64)
+        days = pd.to_datetime(data['Transaction Date']).to_numpy().astype('datetime64[D]').astype(np.int64)
+        merchants = pd.factorize(data['Merchant'])[0]
+        # Signatures are only built for descriptions that appear in candidate pairs
+        descriptions = _DescriptionSignatures(data['Description'])
+
+        frames = []
+        if 'exact' in methods or 'similar' in methods:
+            frames.append(self._same_amount_pairs(cents, days, merchants, descriptions, methods))
+        if 'transfer' in methods and self.account_column in data.columns:
+            accounts = pd.factorize(data[self.account_column])[0]
+            frames.append(self._transfer_pairs(cents, days, accounts, descriptions))
+
+        pairs = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=PAIR_COLUMNS)
+        pairs = pairs.sort_values('score', ascending=False, kind='stable')
+        # A pair matched by several methods is reported once, under its best score
+        pairs = pairs.drop_duplicates(['left', 'right']).reset_index(drop=True)
+
+        pairs['left'] = data.index.to_numpy()[pairs['left'].to_numpy(dtype=np.int64)]
+        pairs['right'] = data.index.to_numpy()[pairs['right'].to_numpy(dtype=np.int64)]
+        return pairs[PAIR_COLUMNS]
+
+    def duplicate_mask(self, data, pairs=None, min_score=0.9):
+        """
+        Flag the later row of every exact or similar pair scoring at least min_score.
+
+        Transfers are not flagged; both legs are genuine transactions.
+
+        Returns:
+            pd.Series: Boolean Series aligned with data.index
+        """
+        if pairs is None:
+            pairs = self.find_duplicates(data, methods=('exact', 'similar'))
+        flagged = pairs.loc[(pairs['method'] != 'transfer') & (pairs['score'] >= min_score), 'right']
+        return pd.Series(data.index.isin(flagged), index=data.index)
+
+    def _same_amount_pairs(self, cents, days, merchants, descriptions, methods):
+        """Exact and similar-description pairs among rows with the same amount."""
+        order = sort_order(cents, days, merchants)
+        left, right = self._window_candidates(order, cents, days, self.window_days)
+
+        days_apart = days[right] - days[left]
+        exact = (days_apart == 0) & (merchants[left] == merchants[right])
+
+        # Exact pairs match on merchant already; only score the descriptions of the rest
+        similarity = np.ones(len(left))
+        if 'similar' in methods:
+            similarity[~exact] = descriptions.similarity(left[~exact], right[~exact])
+
+        # Similar pairs lose up to half their score as they drift to the window edge
+        score = np.where(exact, 1.0, similarity * (1 - 0.5 * days_apart / (self.window_days + 1)))
+        keep = np.zeros(len(left), dtype=bool)
+        if 'exact' in methods:
+            keep |= exact
+        if 'similar' in methods:
+            keep |= ~exact & (similarity >= self.min_similarity)
+
+        return pd.DataFrame({
+            'left': left[keep],
+            'right': right[keep],
+            'method': np.where(exact[keep], 'exact', 'similar'),
+            'days_apart': days_apart[keep],
+            'similarity': similarity[keep],
+            'score': score[keep]
+        })
+
+    def _transfer_pairs(self, cents, days, accounts, descriptions):
+        """Opposite-signed amounts on different accounts within the transfer window."""
+        block = np.abs(cents)
+        order = sort_order(block, days)
+        left, right = self._window_candidates(order, block, days, self.transfer_window_days)
+
+        keep = ((cents[left] == -cents[right]) & (cents[left] != 0)
+                & (accounts[left] != accounts[right]) & (accounts[left] >= 0) & (accounts[right] >= 0))
+        left, right = left[keep], right[keep]
+        days_apart = days[right] - days[left]
+
+        return pd.DataFrame({
+            'left': left,
+            'right': right,
+            'method': 'transfer',
+            'days_apart': days_apart,
+            'similarity': descriptions.similarity(left, right),
+            'score': 1 - days_apart / (self.transfer_window_days + 1)
+        })
+
+    def _window_candidates(self, order, block, days, window_days):
+        """
+        Pair each row with the next max_neighbors rows of its block within window_days.
+
+        Args:
+            order: Row positions sorted by block, then date
+            block: Blocking key per row
+
+        Returns:
+            tuple: Arrays of left and right row positions (left is never later)
+        """
+        sorted_block = block[order]
+        sorted_days = days[order]
+        lefts, rights = [], []
+        for lag in range(1, self.max_neighbors + 1):
+            if lag >= len(order):
+                break
+            match = ((sorted_block[lag:] == sorted_block[:-lag])
+                     & (sorted_days[lag:] - sorted_days[:-lag] <= window_days))
+            if not match.any():
+                break
+            positions = np.flatnonzero(match)
+            lefts.append(order[positions])
+            rights.append(order[positions + lag])
+
+        if not lefts:
+            empty = np.array([], dtype=np.int64)
+            return empty, empty
+        return np.concatenate(lefts), np.concatenate(rights)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Incremental Monthly Aggregates
+
+Keeps per-month x category running sums and counts that are updated with
+each new batch of transactions, so monthly and category summaries do not
+have to be recomputed from the full history on every refresh.
+"""
+
+import pandas as pd
+
+class MonthlyAggregateStore:
+    """
+    Running month x category totals of transaction data.
+
+    Cells hold the income sum (positive), the expense sum (negative, as in
+    BudgetAnalyzer's Total_Expenses) and the transaction count. Updates only
+    touch the cells of the incoming batch.
+    """
+
+    COLUMNS = ['income', 'expenses', 'count']
+
+    def __init__(self, data=None):
+        index = pd.MultiIndex.from_arrays([pd.PeriodIndex([], freq='M'), pd.Index([], dtype=object)],
+                                          names=['month', 'category'])
+        self.table = pd.DataFrame(0, index=index, columns=self.COLUMNS)
+        self.rows_seen = 0
+        if data is not None and not data.empty:
+            self.update(data)
+
+    def update(self, batch):
+        """
+        Add a batch of transactions to the running totals.
+
+        Args:
+            batch: DataFrame with 'Transaction Date', 'Amount' and 'Category_Clean' columns
+        """
+        if batch.empty:
+            return
+        amount = batch['Amount']
+        month = pd.to_datetime(batch['Transaction Date']).dt.to_period('M').rename('month')
+        category = batch['Category_Clean'].astype(object).rename('category')
+
+        # Rows without a category still count towards their month's totals
+        delta = pd.DataFrame({
+            'income': amount.clip(lower=0),
+            'expenses': amount.clip(upper=0),
+            'count': 1
+        }).groupby([month, category], dropna=False).sum()
+
+        self.table = self.table.add(delta, fill_value=0).sort_index()
+        self.table['count'] = self.table['count'].astype(int)
+        self.rows_seen += len(batch)
+
+    def monthly_analysis(self):
+        """
+        Monthly totals in the shape of BudgetAnalyzer.monthly_analysis().
+
+        Returns:
+            pd.DataFrame: Total_Income, Total_Expenses, Net_Amount,
+            Transaction_Count and Savings_Rate per month
+        """
+        monthly = self.table.groupby(level='month').sum()
+        result = pd.DataFrame({
+            'Total_Income': monthly['income'],
+            'Total_Expenses': monthly['expenses'],
+            'Net_Amount': monthly['income'] + monthly['expenses'],
+            'Transaction_Count': monthly['count']
+        })
+        result['Savings_Rate'] = (result['Net_Amount'] / result['Total_Income'].where(result['Total_Income'] > 0) * 100).fillna(0)
+        return result
+
+    def category_analysis(self):
+        """
+        Category totals in the shape of BudgetAnalyzer.category_analysis().
+
+        Returns:
+            pd.DataFrame: Total_Amount, Expense_Amount, Income_Amount,
+            Transaction_Count and Expense_Percentage per category
+        """
+        categories = self.table.groupby(level='category').sum()
+        total_expenses = categories['expenses'].sum()
+        return pd.DataFrame({
+            'Total_Amount': categories['income'] + categories['expenses'],
+            'Expense_Amount': categories['expenses'],
+            'Income_Amount': categories['income'],
+            'Transaction_Count': categories['count'],
+            'Expense_Percentage': categories['expenses'] / total_expenses * 100 if total_expenses else 0.0
+        })
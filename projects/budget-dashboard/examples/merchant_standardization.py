@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Merchant Name Standardization
+
+Maps raw bank descriptors to canonical merchant names, e.g.
+
+    "AMAZON.COM*123456"       -> "Amazon"
+    "SQ *COFFEE SHOP NYC"     -> "Coffee Shop"
+    "TST* RESTAURANT NAME"    -> "Restaurant Name"
+    "7-ELEVEN 1234"           -> "7-Eleven"
+    "24 HOUR FITNESS #0123"   -> "24 Hour Fitness"
+    "99 CENTS ONLY 0042"      -> "99 Cents Only"
+    "76 - GAS STATION 123 CA" -> "76 Gas Station"
+
+Descriptors go through compiled alias and prefix rules, a cleanup pass and
+optionally a fuzzy match against known canonical names via a character
+n-gram index. Names no rule applies to are kept exactly as they are.
+Results are memoized, and only the distinct descriptors of a column are
+standardized before being broadcast back to its rows.
+"""
+
+import json
+import re
+from collections import Counter
+from functools import lru_cache
+import pandas as pd
+import numpy as np
+
+# Descriptors that identify a merchant outright, tried in order: pattern -> canonical name
+# (matched as whole words)
+MERCHANT_ALIASES = {
+    r"AMAZON\s*(?:\.COM|MKTPL?|PRIME)|AMZN": "Amazon",
+    r"NETFLIX": "Netflix",
+    r"SPOTIFY": "Spotify",
+    r"UBER\s*EATS": "Uber Eats",
+    r"UBER": "Uber",
+    r"LYFT": "Lyft",
+    r"APPLE\.COM/BILL|APPLE\s+COM\s+BILL": "Apple",
+    r"WAL-?MART|WM\s+SUPERCENTER": "Walmart",
+    r"TARGET": "Target",
+    r"STARBUCKS": "Starbucks",
+}
+
+# Payment processor prefixes in front of the actual merchant name
+PROCESSOR_PREFIXES = ["SQ *", "TST*", "PAYPAL *", "SP *", "PP*", "GOOGLE *", "PY *", "CKE*", "IC*"]
+
+# Trailing location tokens dropped from descriptors (state codes and common city abbreviations)
+LOCATION_SUFFIXES = {
+    "AK", "AZ", "AR", "CA", "CT", "FL", "GA", "IL", "IA", "KS", "KY", "MD", "MI", "MN", "MS", "MO",
+    "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND", "RI", "SC", "SD", "TN", "TX", "UT", "VT",
+    "VA", "WA", "WV", "WI", "WY", "DC", "NYC", "SF", "USA",
+}
+
+# State codes that are also words in merchant names ("Clothing Co", "Dine In"); only dropped
+# after a store number or another location token
+AMBIGUOUS_LOCATION_SUFFIXES = {
+    "AL", "CO", "DE", "HI", "ID", "IN", "LA", "MA", "ME", "OH", "OK", "OR", "PA", "US",
+}
+
+# Reference numbers after '*' or '#', removed during cleanup
+_REFERENCE = re.compile(r"\*\s*\w*\d\w*|#\s*\w+")
+
+# Trailing store numbers; digits elsewhere may be part of the name ("7-Eleven", "24 Hour Fitness")
+_STORE_NUMBER = re.compile(r"\d{3,}")
+
+# Punctuation dropped from descriptors that were cleaned up (hyphens inside words are kept)
+_PUNCTUATION = re.compile(r"[^\w\s&'-]|(?<!\w)-|-(?!\w)")
+
+class NGramIndex:
+    """
+    Inverted index from character n-grams to canonical names.
+
+    Lookups only score names that share at least one n-gram with the query,
+    using the Dice coefficient of the two n-gram sets.
+    """
+
+    def __init__(self, names, n=3):
+        self.n = n
+        self.names = list(dict.fromkeys(names))
+        self.gram_counts = []
+        self.postings = {}
+        for i, name in enumerate(self.names):
+            grams = self.ngrams(name)
+            self.gram_counts.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(i)
+
+    def ngrams(self, text):
+        padded = f" {' '.join(text.lower().split())} "
+        return {padded[i:i + self.n] for i in range(max(len(padded) - self.n + 1, 1))}
+
+    def best_match(self, text):
+        """
+        Closest canonical name to text.
+
+        Returns:
+            tuple: (name, similarity), or (None, 0.0) if no name shares an n-gram
+        """
+        grams = self.ngrams(text)
+        shared = Counter(i for gram in grams for i in self.postings.get(gram, ()))
+        if not shared:
+            return None, 0.0
+        best, score = max(((i, 2 * count / (len(grams) + self.gram_counts[i])) for i, count in shared.items()),
+                          key=lambda item: item[1])
+        return self.names[best], score
+
+class MerchantStandardizer:
+    """
+    Rule-based merchant standardization with fuzzy fallback and memoization.
+
+    Each distinct descriptor is resolved once: an alias rule wins outright;
+    otherwise processor prefixes, reference numbers and location suffixes
+    are stripped, and the cleaned name is snapped to the closest canonical
+    name when it is similar enough.
+    """
+
+    def __init__(self, canonical_names=None, aliases=None, min_similarity=0.75, cache_size=100_000):
+        """
+        Args:
+            canonical_names: Known merchant names to snap cleaned descriptors to
+            aliases: Alias rules shaped like MERCHANT_ALIASES (the defaults if None)
+            min_similarity: Minimum n-gram similarity for a fuzzy match
+            cache_size: Distinct descriptors kept in the LRU memo
+        """
+        self.aliases = aliases or MERCHANT_ALIASES
+        self.alias_names = list(self.aliases.values())
+        alternatives = "|".join(f"(?P<a{i}>{pattern})" for i, pattern in enumerate(self.aliases))
+        self.alias_pattern = re.compile(f"\\b(?:{alternatives})\\b", re.IGNORECASE)
+        prefixes = "|".join(re.escape(prefix).replace(r"\ ", r"\s*") for prefix in PROCESSOR_PREFIXES)
+        self.prefix_pattern = re.compile(f"^(?:{prefixes})\\s*", re.IGNORECASE)
+        self.min_similarity = min_similarity
+        self.index = NGramIndex(canonical_names) if canonical_names is not None and len(canonical_names) else None
+        self.standardize_one = lru_cache(maxsize=cache_size)(self._standardize_one)
+
+    @classmethod
+    def from_json(cls, path, **options):
+        """Load canonical names (a JSON list) and optional aliases ({"names": [...], "aliases": {...}})."""
+        with open(path) as f:
+            config = json.load(f)
+        if isinstance(config, list):
+            config = {"names": config}
+        return cls(config.get("names"), config.get("aliases"), **options)
+
+    def standardize(self, descriptors):
+        """
+        Standardize a column of raw descriptors.
+
+        Args:
+            descriptors: Series of raw merchant descriptors
+
+        Returns:
+            pd.Series: Canonical merchant name per row (missing stays missing)
+        """
+        codes, uniques = pd.factorize(descriptors)
+        canonical = np.array([self.standardize_one(str(raw)) for raw in uniques] + [None], dtype=object)
+        # Missing descriptors have code -1, which picks the trailing None
+        return pd.Series(canonical[codes], index=descriptors.index, name=descriptors.name)
+
+    def cache_info(self):
+        """Hit/miss statistics of the descriptor memo."""
+        return self.standardize_one.cache_info()
+
+    def _standardize_one(self, raw):
+        alias = self.alias_pattern.search(raw)
+        if alias:
+            return self.alias_names[int(alias.lastgroup[1:])]
+
+        original = " ".join(raw.split())
+        name = self.prefix_pattern.sub("", original)
+        tokens = name.split()
+        while len(tokens) > 1 and (_STORE_NUMBER.fullmatch(tokens[-1])
+                                   or self._is_location_suffix(tokens[-1], tokens[-2])):
+            tokens.pop()
+        name = " ".join(tokens)
+        stripped = _REFERENCE.sub(" ", name)
+
+        if stripped != name or len(name) != len(original):
+            # Something was stripped, so the rest is a raw descriptor: tidy it up
+            tokens = _PUNCTUATION.sub(" ", stripped).split()
+            cleaned = " ".join(self._capitalize(token) for token in tokens) or original
+        else:
+            cleaned = original
+
+        if self.index is not None:
+            match, similarity = self.index.best_match(cleaned)
+            if similarity >= self.min_similarity:
+                return match
+        return cleaned
+
+    @staticmethod
+    def _is_location_suffix(token, previous):
+        token = _PUNCTUATION.sub("", token).upper()
+        if token in LOCATION_SUFFIXES:
+            return True
+        if token in AMBIGUOUS_LOCATION_SUFFIXES:
+            return (bool(_REFERENCE.fullmatch(previous) or _STORE_NUMBER.fullmatch(previous))
+                    or _PUNCTUATION.sub("", previous).upper() in LOCATION_SUFFIXES)
+        return False
+
+    @staticmethod
+    def _capitalize(token):
+        """Title-case all-caps or all-lowercase words; keep mixed case and names like AT&T."""
+        if "-" in token:
+            return "-".join(MerchantStandardizer._capitalize(part) for part in token.split("-"))
+        if token.isalpha() and (token.isupper() or token.islower()):
+            return token.capitalize()
+        return token
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Columnar Transaction Store
+
+Keeps an Arrow IPC copy of the cleaned transactions CSV so analysis jobs
+can memory-map it instead of re-parsing the CSV on every run. The cache is
+sorted by date, stores merchant/category columns dictionary-encoded and
+timestamps pre-parsed, and is rebuilt whenever the CSV changes.
+"""
+
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+DEFAULT_CSV_PATH = Path("data/processed/cleaned_transactions.csv")
+DATE_COLUMN = "Transaction Date"
+CATEGORICAL_COLUMNS = ["Merchant", "Category_Clean", "Bank"]
+
+class TransactionStore:
+    """Memory-mapped columnar cache of a transactions CSV."""
+
+    def __init__(self, csv_path=DEFAULT_CSV_PATH, cache_path=None):
+        self.csv_path = Path(csv_path)
+        self.cache_path = Path(cache_path) if cache_path else self.csv_path.with_suffix(".arrow")
+
+    def load(self, columns=None, start_date=None, end_date=None):
+        """
+        Load transactions, optionally projected to columns and a date range.
+
+        Args:
+            columns: Columns to return (all if None)
+            start_date: First date to include
+            end_date: Last date to include (inclusive)
+
+        Returns:
+            pd.DataFrame: Matching transactions sorted by date
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return self._load_csv(columns, start_date, end_date)
+
+        if not self.is_fresh():
+            self.build()
+        return self._load_arrow(columns, start_date, end_date)
+
+    def is_fresh(self):
+        """True if the cache exists and was built from the current CSV."""
+        if not self.cache_path.exists():
+            return False
+        import pyarrow as pa
+
+        with pa.memory_map(str(self.cache_path)) as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+        return metadata.get(b"source_signature") == self._source_signature().encode()
+
+    def build(self):
+        """Parse the CSV once and write the sorted, dictionary-encoded Arrow cache."""
+        import pyarrow as pa
+
+        data = pd.read_csv(self.csv_path, parse_dates=[DATE_COLUMN])
+        data = data.sort_values(DATE_COLUMN, kind="stable").reset_index(drop=True)
+        for column in CATEGORICAL_COLUMNS:
+            if column in data.columns:
+                data[column] = data[column].astype("category")
+
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            b"source_signature": self._source_signature().encode()
+        })
+
+        # Write to a temporary file first so readers never see a partial cache
+        tmp_path = self.cache_path.with_suffix(".arrow.tmp")
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        tmp_path.replace(self.cache_path)
+
+    def _load_arrow(self, columns, start_date, end_date):
+        import pyarrow as pa
+
+        # Buffers reference the mapping directly; it is released with the table
+        table = pa.ipc.open_file(pa.memory_map(str(self.cache_path))).read_all()
+
+        # Rows are sorted by date, so the range predicate is a zero-copy slice
+        if start_date is not None or end_date is not None:
+            dates = table.column(DATE_COLUMN).to_numpy()
+            lo = 0 if start_date is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start_date)), "left")
+            hi = len(dates) if end_date is None else np.searchsorted(
+                dates, np.datetime64(self._end_of_day(end_date)), "right"
+            )
+            table = table.slice(lo, hi - lo)
+
+        if columns is not None:
+            table = table.select(list(columns))
+        return table.to_pandas()
+
+    def _load_csv(self, columns, start_date, end_date):
+        """Fallback when pyarrow is not installed: parse only the needed columns."""
+        usecols = None if columns is None else list(dict.fromkeys([*columns, DATE_COLUMN]))
+        data = pd.read_csv(self.csv_path, usecols=usecols, parse_dates=[DATE_COLUMN])
+        if start_date is not None:
+            data = data[data[DATE_COLUMN] >= pd.Timestamp(start_date)]
+        if end_date is not None:
+            data = data[data[DATE_COLUMN] <= self._end_of_day(end_date)]
+        data = data.sort_values(DATE_COLUMN, kind="stable").reset_index(drop=True)
+        return data if columns is None else data[list(columns)]
+
+    def _source_signature(self):
+        stat = self.csv_path.stat()
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    @staticmethod
+    def _end_of_day(date):
+        """Inclusive upper bound: a bare date includes the whole day."""
+        timestamp = pd.Timestamp(date)
+        if timestamp == timestamp.normalize():
+            timestamp += pd.Timedelta(days=1) - pd.Timedelta(1, unit="ns")
+        return timestamp
@@ -6,25 +6,427 @@ Creates realistic but anonymized financial data for documentation examples.
 Generates charts and visualizations that can be safely shared publicly.
 """
 
+import argparse
+import hashlib
+import importlib.metadata
+import importlib.util
+import inspect
+import json
+import pickle
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
-import random
+from datetime import datetime
 from pathlib import Path
 
-# Set style
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
+# matplotlib, seaborn and plotly are imported on first use so that data-only
+# runs (e.g. --stream-rows) do not pay for loading the plotting stack.
+_plt = None
+
+def _load_pyplot():
+    """Import pyplot on first use and apply the documentation chart style."""
+    global _plt
+    if _plt is None:
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
+        # Set style
+        plt.style.use('seaborn-v0_8')
+        sns.set_palette("husl")
+        _plt = plt
+    return _plt
+
+# Whether plotly static image export (kaleido) is usable; probed once per process
+_kaleido = None
+
+def _kaleido_available():
+    """
+    Probe plotly static image export once per process with a tiny real export.
+
+    An installed kaleido is not enough: kaleido 1.x also needs a Chrome it
+    can launch, and fails only when an image is actually written.
+    """
+    global _kaleido
+    if _kaleido is None:
+        _kaleido = False
+        if importlib.util.find_spec("kaleido") is not None:
+            try:
+                import plotly.graph_objects as go
+                import plotly.io as pio
+                pio.to_image(go.Figure(), format="png", width=10, height=10)
+                _kaleido = True
+            except Exception:
+                pass
+    return _kaleido
+
+def _kaleido_version():
+    """Installed kaleido version (None if missing), a cheap stand-in for the probe in fingerprints."""
+    try:
+        return importlib.metadata.version("kaleido")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+def transaction_amounts(data):
+    """Dollar amounts of a sample frame in either the standard or compact layout."""
+    if 'amount' in data.columns:
+        return data['amount']
+    return data['amount_cents'] / 100
+
+def memory_report(data):
+    """
+    Resident memory of a DataFrame per column.
+
+    Returns:
+        pd.Series: Bytes per column (deep, including string payloads) plus a 'total' entry
+    """
+    usage = data.memory_usage(deep=True, index=False)
+    usage['total'] = usage.sum()
+    return usage
+
+class AggregateCube:
+    """
+    Month x category x merchant x weekday rollup of a transaction frame.
+
+    Each cell holds income and expense sums (both positive) with their row
+    counts. Charts roll the cube up to the dimensions they need instead of
+    regrouping the raw transactions.
+    """
+    
+    DIMENSIONS = ['month', 'category', 'merchant', 'weekday']
+    
+    def __init__(self, data):
+        amount = transaction_amounts(data)
+        cells = pd.DataFrame({
+            'month': data['date'].dt.to_period('M'),
+            'category': data['category'],
+            'merchant': data['merchant'],
+            'weekday': data['date'].dt.dayofweek,
+            'income': amount.clip(lower=0),
+            'expense': (-amount).clip(lower=0),
+            'income_count': (amount > 0).astype(np.int64),
+            'expense_count': (amount < 0).astype(np.int64),
+            'count': np.ones(len(data), dtype=np.int64)
+        })
+        self.table = cells.groupby(self.DIMENSIONS, observed=True, sort=True).sum()
+    
+    def append(self, data):
+        """
+        Fold a batch of new transactions into the cube in place.
+
+        Only the batch is grouped; its cells are added to the existing sums,
+        so refreshing charts after new rows arrive does not regroup history.
+        """
+        batch = AggregateCube(data).table
+        table = self.table.add(batch, fill_value=0)
+        count_columns = ['income_count', 'expense_count', 'count']
+        table[count_columns] = table[count_columns].astype(np.int64)
+        self.table = table.sort_index()
+    
+    def rollup(self, *dimensions, category=None):
+        """
+        Sum the cube over every dimension not listed.
+
+        Args:
+            dimensions: Dimensions to keep (any of DIMENSIONS)
+            category: Optional category to restrict the rollup to
+
+        Returns:
+            pd.DataFrame: Sums, counts, net, gross (income + expense) and means
+        """
+        table = self.table
+        if category is not None:
+            table = table[table.index.get_level_values('category') == category]
+        
+        totals = table.groupby(level=list(dimensions), observed=True, sort=True).sum()
+        totals['net'] = totals['income'] - totals['expense']
+        totals['gross'] = totals['income'] + totals['expense']
+        totals['income_mean'] = totals['income'] / totals['income_count'].where(totals['income_count'] > 0)
+        totals['expense_mean'] = totals['expense'] / totals['expense_count'].where(totals['expense_count'] > 0)
+        totals['gross_mean'] = totals['gross'] / totals['count']
+        return totals
+    
+    def fingerprint(self):
+        """Content hash of the cube cells, stable across runs for identical data."""
+        cells = self.table.reset_index()
+        cells['month'] = cells['month'].astype(str)
+        hashes = pd.util.hash_pandas_object(cells, index=False).values
+        return hashlib.sha256(hashes.tobytes()).hexdigest()
+    
+    def daily_expenses(self):
+        """Total expenses per day of week, indexed Monday to Sunday."""
+        daily = self.rollup('weekday')['expense'].reindex(range(7), fill_value=0)
+        daily.index = DAY_NAMES
+        return daily
+
+MANIFEST_NAME = ".asset-manifest.json"
+
+# Default seed of the docs build: the sample data is illustrative, and a fixed
+# seed keeps it reproducible and lets unchanged charts hit the asset cache
+DOCS_SEED = 42
+
+# Output settings per render profile. "publish" reproduces the documentation
+# images; "draft" skips the tight-bbox layout pass and renders at screen DPI.
+RENDER_PROFILES = {
+    "publish": {"dpi": 300, "bbox_inches": "tight", "rasterized": False, "backend": None},
+    "draft": {"dpi": 72, "bbox_inches": None, "rasterized": True, "backend": "Agg"},
+}
+
+# HTML export settings for the interactive dashboard. "standalone" inlines
+# plotly.js into every file; "shared" references one plotly.min.js copied
+# next to the dashboards, caps trace length and stores values as float32.
+# float32 only pays off where plotly writes numpy arrays as base64 typed
+# arrays (plotly 6+); older plotly writes each value as decimal text, where
+# float32 rounding makes the numbers longer, so the cast is skipped there.
+HTML_EXPORTS = {
+    "standalone": {"include_plotlyjs": True, "max_points": None, "dtype": "float64"},
+    "shared": {"include_plotlyjs": "directory", "max_points": 240, "dtype": "float32"},
+}
+
+def _plotly_typed_arrays():
+    """Whether the installed plotly serializes numpy arrays as typed arrays (6.0 and later)."""
+    try:
+        return int(importlib.metadata.version("plotly").split(".")[0]) >= 6
+    except (importlib.metadata.PackageNotFoundError, ValueError):
+        return False
+
+def html_export_settings(html_export):
+    """HTML_EXPORTS entry with dtype resolved for the installed plotly."""
+    settings = dict(HTML_EXPORTS[html_export])
+    if not _plotly_typed_arrays():
+        settings["dtype"] = "float64"
+    return settings
+
+def decimate_series(series, max_points):
+    """
+    Downsample a series to at most max_points, keeping each bucket's min and max.
+
+    Peaks and troughs survive, so a decimated line still shows the same range.
+    """
+    if max_points is None or len(series) <= max_points:
+        return series
+    values = series.to_numpy()
+    edges = np.linspace(0, len(values), max_points // 2 + 1).astype(np.int64)
+    keep = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        bucket = values[lo:hi]
+        keep += [lo + bucket.argmin(), lo + bucket.argmax()]
+    return series.iloc[np.unique(keep)]
+
+class AssetCache:
+    """
+    Manifest of chart fingerprints used to skip re-rendering unchanged charts.
+
+    Each entry maps a chart method to the fingerprint it was last rendered
+    with and the files it wrote. A chart is fresh when its fingerprint
+    matches and all of its files still exist.
+    """
+    
+    def __init__(self, manifest_path):
+        self.manifest_path = Path(manifest_path)
+        self.entries = {}
+        if self.manifest_path.exists():
+            try:
+                self.entries = json.loads(self.manifest_path.read_text()).get("charts", {})
+            except (json.JSONDecodeError, AttributeError):
+                self.entries = {}
+        self.hits = []
+        self.misses = []
+    
+    def is_fresh(self, name, fingerprint, outputs):
+        """Return True (and count a hit) if the chart can be skipped."""
+        entry = self.entries.get(name)
+        fresh = (entry is not None and entry.get("fingerprint") == fingerprint
+                 and all(Path(path).exists() for path in outputs))
+        (self.hits if fresh else self.misses).append(name)
+        return fresh
+    
+    def record(self, name, fingerprint, outputs):
+        """Store the fingerprint a chart was rendered with."""
+        self.entries[name] = {"fingerprint": fingerprint, "outputs": list(outputs)}
+    
+    def save(self):
+        """Write the manifest, including the hits and misses of this run."""
+        manifest = {
+            "charts": self.entries,
+            "last_run": {"hits": self.hits, "misses": self.misses}
+        }
+        self.manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    
+    def report(self):
+        """One-line summary of cache hits and misses."""
+        return f"Asset cache: {len(self.hits)} hit(s), {len(self.misses)} miss(es)"
+
+TIMINGS_NAME = ".asset-timings.json"
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+class RunInstrumentation:
+    """
+    Wall time, CPU time and memory high-water mark per stage of an asset build.
+
+    ru_maxrss only reports the process-lifetime peak, so each stage records
+    peak_rss_so_far_mb: the peak up to the end of that stage, not the
+    stage's own peak.
+
+    Each chart render is also split into aggregation (cube rollups), encode
+    (savefig, write_html, write_image) and figure build, which is whatever
+    remains of the chart's wall time.
+    """
+    
+    def __init__(self):
+        self.stages = {}
+        self.charts = {}
+        self._phases = None
+    
+    @property
+    def in_chart(self):
+        return self._phases is not None
+    
+    @contextmanager
+    def stage(self, name):
+        """Time a top-level stage of the run."""
+        with self._measure(self.stages, name):
+            yield
+    
+    @contextmanager
+    def chart(self, name):
+        """Time one chart render and break it down into its phases."""
+        self._phases = {"aggregate_s": 0.0, "encode_s": 0.0}
+        try:
+            with self._measure(self.charts, name):
+                yield
+        finally:
+            record = self.charts[name]
+            record.update(self._phases)
+            record["build_s"] = max(record["wall_s"] - record["aggregate_s"] - record["encode_s"], 0.0)
+            self._phases = None
+    
+    @contextmanager
+    def phase(self, kind):
+        """Add the enclosed wall time to the current chart's 'aggregate' or 'encode' share."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self._phases is not None:
+                self._phases[f"{kind}_s"] += time.perf_counter() - start
+    
+    @contextmanager
+    def profile(self, profiler, output_path):
+        """
+        Run the enclosed code under cProfile or pyinstrument.
+
+        Args:
+            profiler: 'cprofile', 'pyinstrument' or None to disable profiling
+            output_path: cProfile stats file or pyinstrument HTML report to write
+        """
+        if profiler is None:
+            yield
+        elif profiler == "cprofile":
+            import cProfile
+            
+            prof = cProfile.Profile()
+            prof.enable()
+            try:
+                yield
+            finally:
+                prof.disable()
+                prof.dump_stats(output_path)
+        elif profiler == "pyinstrument":
+            from pyinstrument import Profiler
+            
+            prof = Profiler()
+            prof.start()
+            try:
+                yield
+            finally:
+                prof.stop()
+                Path(output_path).write_text(prof.output_html())
+        else:
+            raise ValueError(f"Unknown profiler: {profiler}")
+    
+    def summary(self, **run_info):
+        """JSON-serializable report of the run."""
+        return {
+            **run_info,
+            "peak_rss_mb": _peak_rss_mb(),
+            "stages": self.stages,
+            "charts": self.charts
+        }
+    
+    @staticmethod
+    @contextmanager
+    def _measure(records, name):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            records[name] = {
+                "wall_s": time.perf_counter() - wall,
+                "cpu_s": time.process_time() - cpu,
+                "peak_rss_so_far_mb": _peak_rss_mb()
+            }
+
+class _TimedCube:
+    """AggregateCube view that books rollup time to the chart being rendered."""
+    
+    def __init__(self, cube, instrumentation):
+        self._cube = cube
+        self._instrumentation = instrumentation
+    
+    def rollup(self, *dimensions, category=None):
+        with self._instrumentation.phase("aggregate"):
+            return self._cube.rollup(*dimensions, category=category)
+    
+    def daily_expenses(self):
+        with self._instrumentation.phase("aggregate"):
+            return self._cube.daily_expenses()
+    
+    def __getattr__(self, name):
+        return getattr(self._cube, name)
 
 class SampleDataGenerator:
     """Generates realistic sample financial data for documentation."""
     
-    def __init__(self):
+    # Chart methods run by generate_all_documentation_assets (in order) and the files they write
+    CHART_OUTPUTS = {
+        "create_monthly_trends_chart": ["monthly-trends.png"],
+        "create_category_breakdown_chart": ["category-breakdown.png"],
+        "create_top_merchants_chart": ["top-merchants.png"],
+        "create_income_sources_chart": ["income-sources.png"],
+        "create_daily_patterns_chart": ["daily-patterns.png"],
+        "create_subscriptions_chart": ["subscriptions-analysis.png"],
+        "create_interactive_dashboard_preview": ["interactive-dashboard-preview.html", "dashboard-overview.png"],
+    }
+    CHART_METHODS = tuple(CHART_OUTPUTS)
+    
+    def __init__(self, seed=None, profile="publish", html_export="standalone"):
+        if profile not in RENDER_PROFILES:
+            raise ValueError(f"Unknown render profile: {profile}")
+        if html_export not in HTML_EXPORTS:
+            raise ValueError(f"Unknown HTML export mode: {html_export}")
+        self.rng = np.random.default_rng(seed)
+        self.profile = profile
+        self.render_profile = RENDER_PROFILES[profile]
+        self.html_export = html_export
+        self.html_settings = html_export_settings(html_export)
+        self._cube = None
+        self._cube_source = None
+        self.instrumentation = None
         self.start_date = datetime(2024, 1, 1)
         self.end_date = datetime(2024, 11, 30)
         self.docs_dir = Path("docs")
@@ -69,29 +471,9 @@ class SampleDataGenerator:
         self.income_sources = [
             "Tech Company Salary", "Freelance Work", "Investment Returns", "Side Project"
         ]
-    
-    def generate_sample_data(self, n_transactions=2000):
-        """Generate sample transaction data."""
-        transactions = []
-        current_date = self.start_date
         
-        while current_date <= self.end_date:
-            # Generate 3-8 transactions per day
-            daily_transactions = random.randint(3, 8)
-            
-            for _ in range(daily_transactions):
-                transaction = self._generate_transaction(current_date)
-                transactions.append(transaction)
-            
-            current_date += timedelta(days=1)
-        
-        df = pd.DataFrame(transactions)
-        return df.sample(n=min(n_transactions, len(df))).sort_values('date').reset_index(drop=True)
-    
-    def _generate_transaction(self, date):
-        """Generate a single transaction."""
-        # Choose category (weighted by typical spending frequency)
-        category_weights = {
+        # Category frequency weights (typical spending frequency)
+        self.category_weights = {
             "Food & Dining": 0.25,
             "Shopping": 0.20,
             "Transportation": 0.15,
@@ -103,55 +485,236 @@ class SampleDataGenerator:
             "Income": 0.05
         }
         
-        category = np.random.choice(
-            list(category_weights.keys()),
-            p=list(category_weights.values())
-        )
+        # Category-specific amount ranges (income is positive, expenses negative)
+        self.amount_ranges = {
+            "Food & Dining": (8, 75),
+            "Shopping": (15, 200),
+            "Transportation": (5, 80),
+            "Entertainment": (10, 120),
+            "Utilities": (50, 350),
+            "Subscriptions": (5, 50),
+            "Healthcare": (25, 500),
+            "Housing": (800, 2500),
+            "Income": (2500, 5500)
+        }
         
-        if category == "Income":
-            merchant = random.choice(self.income_sources)
-            amount = random.uniform(2500, 5500)  # Positive for income
-            amount = round(amount, 2)
-        else:
-            merchant = random.choice(self.merchants[category])
-            # Category-specific amount ranges
-            amount_ranges = {
-                "Food & Dining": (8, 75),
-                "Shopping": (15, 200),
-                "Transportation": (5, 80),
-                "Entertainment": (10, 120),
-                "Utilities": (50, 350),
-                "Subscriptions": (5, 50),
-                "Healthcare": (25, 500),
-                "Housing": (800, 2500)
+        self._build_lookup_tables()
+    
+    def _build_lookup_tables(self):
+        """Flatten the category, merchant and amount tables into arrays indexed by category code."""
+        self.categories = np.array(list(self.category_weights), dtype=object)
+        self.category_probs = np.array(list(self.category_weights.values()))
+        
+        pools = [self.income_sources if c == "Income" else self.merchants[c] for c in self.categories]
+        self.merchant_pool = np.array([m for pool in pools for m in pool], dtype=object)
+        self.description_pool = np.array([f"{m} Purchase" for m in self.merchant_pool], dtype=object)
+        
+        # Unique merchant names and the code of each pool entry, for categorical output
+        self.merchant_names, self.merchant_codes = np.unique(self.merchant_pool.astype(str), return_inverse=True)
+        self.description_names = np.array([f"{m} Purchase" for m in self.merchant_names], dtype=object)
+        self.merchant_counts = np.array([len(pool) for pool in pools])
+        self.merchant_offsets = np.concatenate(([0], np.cumsum(self.merchant_counts)[:-1]))
+        
+        bounds = np.array([self.amount_ranges[c] for c in self.categories], dtype=float)
+        self.amount_low = bounds[:, 0]
+        self.amount_high = bounds[:, 1]
+        self.amount_sign = np.where(self.categories == "Income", 1.0, -1.0)
+    
+    def generate_sample_data(self, n_transactions=2000, start_date=None, end_date=None, compact=False):
+        """
+        Generate sample transaction data.
+
+        All columns are drawn in a handful of array operations, so the cost is
+        dominated by building the DataFrame rather than by Python loops.
+
+        Args:
+            n_transactions: Exact number of rows to generate
+            start_date: First day of the range (defaults to self.start_date)
+            end_date: Last day of the range, inclusive (defaults to self.end_date)
+            compact: Use the compact layout (categorical merchant, category and
+                description; int64 ``amount_cents`` instead of float ``amount``)
+
+        Returns:
+            pd.DataFrame: Transactions sorted by date
+        """
+        start, n_days = self._resolve_date_range(start_date, end_date)
+        day_offsets = np.sort(self.rng.integers(0, n_days, size=n_transactions))
+        return pd.DataFrame(self._generate_columns(day_offsets, start, compact))
+    
+    def iter_sample_chunks(self, total_rows, chunk_size=1_000_000, start_date=None, end_date=None,
+                           compact=False):
+        """
+        Yield sample transactions as fixed-size, date-ordered DataFrame chunks.
+
+        Rows are spread over the days of the range up front, so only the
+        per-day counts and one chunk are held in memory at a time. Chunks
+        concatenate to a single date-sorted history.
+
+        Args:
+            total_rows: Total number of rows across all chunks
+            chunk_size: Rows per chunk (the last chunk may be smaller)
+            start_date: First day of the range (defaults to self.start_date)
+            end_date: Last day of the range, inclusive (defaults to self.end_date)
+            compact: Yield chunks in the compact layout (see generate_sample_data)
+
+        Yields:
+            pd.DataFrame: Next chunk of transactions
+        """
+        start, n_days = self._resolve_date_range(start_date, end_date)
+        day_counts = self.rng.multinomial(total_rows, np.full(n_days, 1 / n_days))
+        day_ends = np.cumsum(day_counts)
+        
+        for chunk_start in range(0, total_rows, chunk_size):
+            rows = np.arange(chunk_start, min(chunk_start + chunk_size, total_rows))
+            day_offsets = np.searchsorted(day_ends, rows, side='right')
+            yield pd.DataFrame(self._generate_columns(day_offsets, start, compact))
+    
+    def write_sample_data(self, total_rows, output_dir="data/raw", chunk_size=1_000_000,
+                          start_date=None, end_date=None, file_format="csv"):
+        """
+        Stream sample transactions to partitioned files in the importer's raw layout.
+
+        Each chunk is written to its own file under ``<output_dir>/capital_one/``
+        using the Capital One export columns (Date, Description, Amount, Category).
+
+        Args:
+            total_rows: Total number of rows to write
+            output_dir: Raw data directory (``data/raw`` by default)
+            chunk_size: Rows per output file
+            start_date: First day of the range (defaults to self.start_date)
+            end_date: Last day of the range, inclusive (defaults to self.end_date)
+            file_format: 'csv' or 'parquet'
+
+        Returns:
+            list: Paths of the files written
+        """
+        if file_format not in ("csv", "parquet"):
+            raise ValueError(f"Unsupported file format: {file_format}")
+        
+        target_dir = Path(output_dir) / "capital_one"
+        target_dir.mkdir(parents=True, exist_ok=True)
+        
+        paths = []
+        chunks = self.iter_sample_chunks(total_rows, chunk_size, start_date, end_date)
+        for part, chunk in enumerate(chunks):
+            first, last = chunk['date'].iloc[0], chunk['date'].iloc[-1]
+            name = f"capital_one_sample_{first:%Y_%m_%d}_to_{last:%Y_%m_%d}_part{part:05d}.{file_format}"
+            export = chunk[['date', 'description', 'amount', 'category']].rename(columns={
+                'date': 'Date', 'description': 'Description', 'amount': 'Amount', 'category': 'Category'
+            })
+            
+            path = target_dir / name
+            if file_format == "csv":
+                export.to_csv(path, index=False, date_format='%Y-%m-%d')
+            else:
+                export.to_parquet(path, index=False)
+            paths.append(path)
+            print(f"  - wrote {len(export):,} rows to {path}")
+        
+        return paths
+    
+    def _resolve_date_range(self, start_date, end_date):
+        """Return the normalized start timestamp and the inclusive number of days."""
+        start = pd.Timestamp(start_date if start_date is not None else self.start_date).normalize()
+        end = pd.Timestamp(end_date if end_date is not None else self.end_date).normalize()
+        if end < start:
+            raise ValueError("end_date must not be before start_date")
+        return start, (end - start).days + 1
+    
+    def _generate_columns(self, day_offsets, start, compact=False):
+        """Draw one transaction per day offset (days after start) as column arrays."""
+        n = len(day_offsets)
+        codes = self.rng.choice(len(self.categories), size=n, p=self.category_probs)
+        
+        # Pick a merchant within each row's category slice of the flat pool
+        counts = self.merchant_counts[codes]
+        merchant_idx = self.merchant_offsets[codes] + (self.rng.random(n) * counts).astype(np.int64)
+        
+        low = self.amount_low[codes]
+        high = self.amount_high[codes]
+        amounts = self.amount_sign[codes] * (low + self.rng.random(n) * (high - low))
+        dates = start + pd.to_timedelta(day_offsets, unit="D")
+        
+        if compact:
+            # Description is a pure function of merchant, so it shares the merchant codes
+            merchant_codes = self.merchant_codes[merchant_idx]
+            return {
+                "date": dates,
+                "merchant": pd.Categorical.from_codes(merchant_codes, self.merchant_names),
+                "category": pd.Categorical.from_codes(codes, self.categories.astype(str)),
+                "amount_cents": np.round(amounts * 100).astype(np.int64),
+                "description": pd.Categorical.from_codes(merchant_codes, self.description_names)
             }
-            min_amt, max_amt = amount_ranges[category]
-            amount = -random.uniform(min_amt, max_amt)  # Negative for expenses
-            amount = round(amount, 2)
         
+        amounts = np.round(amounts, 2)
         return {
-            "date": date,
-            "merchant": merchant,
-            "category": category,
-            "amount": amount,
-            "description": f"{merchant} Purchase"
+            "date": dates,
+            "merchant": self.merchant_pool[merchant_idx],
+            "category": self.categories[codes],
+            "amount": amounts,
+            "description": self.description_pool[merchant_idx]
         }
     
+    def aggregate_cube(self, data):
+        """
+        Return the AggregateCube for a dataset, building it once per dataset.
+
+        Chart methods accept either a transaction DataFrame or a prebuilt cube.
+        During an instrumented chart render the cube's rollups are timed.
+        """
+        if isinstance(data, AggregateCube):
+            cube = data
+        else:
+            if self._cube_source is not data:
+                self._cube = AggregateCube(data)
+                self._cube_source = data
+            cube = self._cube
+        if self.instrumentation is not None and self.instrumentation.in_chart:
+            return _TimedCube(cube, self.instrumentation)
+        return cube
+    
+    def _phase(self, kind):
+        """Book the enclosed time to a chart phase when the run is instrumented."""
+        if self.instrumentation is None:
+            return nullcontext()
+        return self.instrumentation.phase(kind)
+    
+    def _pyplot(self):
+        """Return pyplot, switched to the render profile's backend if it sets one."""
+        plt = _load_pyplot()
+        backend = self.render_profile["backend"]
+        if backend and plt.get_backend().lower() != backend.lower():
+            plt.switch_backend(backend)
+        return plt
+    
+    def _save_figure(self, filename, dpi=None):
+        """Save and close the current matplotlib figure using the active render profile."""
+        plt = self._pyplot()
+        settings = self.render_profile
+        fig = plt.gcf()
+        if settings["rasterized"]:
+            for ax in fig.axes:
+                ax.set_rasterized(True)
+        dpi = settings["dpi"] if dpi is None else min(dpi, settings["dpi"])
+        with self._phase("encode"):
+            fig.savefig(self.images_dir / filename, dpi=dpi, bbox_inches=settings["bbox_inches"])
+        plt.close(fig)
+    
     def create_monthly_trends_chart(self, data):
         """Create monthly trends visualization."""
-        monthly_data = data.groupby([data['date'].dt.to_period('M'), 'category'])['amount'].sum().unstack(fill_value=0)
-        monthly_totals = data.groupby(data['date'].dt.to_period('M'))['amount'].sum()
+        plt = self._pyplot()
+        monthly = self.aggregate_cube(data).rollup('month')
         
         # Separate income and expenses
-        monthly_income = data[data['amount'] > 0].groupby(data['date'].dt.to_period('M'))['amount'].sum()
-        monthly_expenses = data[data['amount'] < 0].groupby(data['date'].dt.to_period('M'))['amount'].sum()
+        monthly_income = monthly.loc[monthly['income_count'] > 0, 'income']
+        monthly_expenses = monthly.loc[monthly['expense_count'] > 0, 'expense']
         
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
         
         # Income vs Expenses
         ax1.plot(monthly_income.index.astype(str), monthly_income.values, 
                 marker='o', label='Income', color='green', linewidth=3)
-        ax1.plot(monthly_expenses.index.astype(str), abs(monthly_expenses.values), 
+        ax1.plot(monthly_expenses.index.astype(str), monthly_expenses.values, 
                 marker='o', label='Expenses', color='red', linewidth=3)
         ax1.set_title('Monthly Income vs Expenses', fontsize=16, fontweight='bold')
         ax1.set_ylabel('Amount ($)', fontsize=12)
@@ -160,7 +723,7 @@ class SampleDataGenerator:
         ax1.tick_params(axis='x', rotation=45)
         
         # Net Amount (Savings)
-        net_amount = monthly_income + monthly_expenses  # expenses are negative
+        net_amount = monthly['net']
         colors = ['green' if x > 0 else 'red' for x in net_amount]
         ax2.bar(range(len(net_amount)), net_amount.values, color=colors, alpha=0.7)
         ax2.set_title('Monthly Net Amount (Savings/Deficit)', fontsize=16, fontweight='bold')
@@ -172,16 +735,14 @@ class SampleDataGenerator:
         ax2.axhline(y=0, color='black', linestyle='-', alpha=0.5)
         
         plt.tight_layout()
-        plt.savefig(self.images_dir / 'monthly-trends.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        self._save_figure('monthly-trends.png')
     
     def create_category_breakdown_chart(self, data):
         """Create category breakdown visualization."""
-        # Filter to expenses only
-        expenses = data[data['amount'] < 0].copy()
-        expenses['amount'] = abs(expenses['amount'])
-        
-        category_totals = expenses.groupby('category')['amount'].sum().sort_values(ascending=False)
+        plt = self._pyplot()
+        # Expenses only
+        categories = self.aggregate_cube(data).rollup('category')
+        category_totals = categories.loc[categories['expense_count'] > 0, 'expense'].sort_values(ascending=False)
         
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
         
@@ -206,19 +767,19 @@ class SampleDataGenerator:
                     f'${width:,.0f}', ha='left', va='center', fontweight='bold')
         
         plt.tight_layout()
-        plt.savefig(self.images_dir / 'category-breakdown.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        self._save_figure('category-breakdown.png')
     
     def create_top_merchants_chart(self, data):
         """Create top merchants visualization."""
-        expenses = data[data['amount'] < 0].copy()
-        expenses['amount'] = abs(expenses['amount'])
+        plt = self._pyplot()
+        merchants = self.aggregate_cube(data).rollup('merchant')
+        merchants = merchants[merchants['expense_count'] > 0]
         
-        merchant_data = expenses.groupby('merchant').agg({
-            'amount': ['sum', 'count', 'mean']
+        merchant_data = pd.DataFrame({
+            'Total_Amount': merchants['expense'],
+            'Transaction_Count': merchants['expense_count'],
+            'Avg_Amount': merchants['expense_mean']
         }).round(2)
-        
-        merchant_data.columns = ['Total_Amount', 'Transaction_Count', 'Avg_Amount']
         top_merchants = merchant_data.sort_values('Total_Amount', ascending=True).tail(15)
         
         fig, ax = plt.subplots(figsize=(12, 8))
@@ -239,13 +800,13 @@ class SampleDataGenerator:
         
         ax.grid(True, alpha=0.3, axis='x')
         plt.tight_layout()
-        plt.savefig(self.images_dir / 'top-merchants.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        self._save_figure('top-merchants.png')
     
     def create_income_sources_chart(self, data):
         """Create income sources visualization."""
-        income = data[data['amount'] > 0].copy()
-        income_sources = income.groupby('merchant')['amount'].sum().sort_values(ascending=True)
+        plt = self._pyplot()
+        merchants = self.aggregate_cube(data).rollup('merchant')
+        income_sources = merchants.loc[merchants['income_count'] > 0, 'income'].sort_values(ascending=True)
         
         fig, ax = plt.subplots(figsize=(12, 6))
         
@@ -265,17 +826,12 @@ class SampleDataGenerator:
         
         ax.grid(True, alpha=0.3, axis='x')
         plt.tight_layout()
-        plt.savefig(self.images_dir / 'income-sources.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        self._save_figure('income-sources.png')
     
     def create_daily_patterns_chart(self, data):
         """Create daily spending patterns chart."""
-        expenses = data[data['amount'] < 0].copy()
-        expenses['amount'] = abs(expenses['amount'])
-        expenses['day_of_week'] = expenses['date'].dt.day_name()
-        
-        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        daily_spending = expenses.groupby('day_of_week')['amount'].sum().reindex(day_order)
+        plt = self._pyplot()
+        daily_spending = self.aggregate_cube(data).daily_expenses()
         
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
         
@@ -297,24 +853,24 @@ class SampleDataGenerator:
         ax2.set_title('Weekday vs Weekend Spending', fontsize=14, fontweight='bold')
         
         plt.tight_layout()
-        plt.savefig(self.images_dir / 'daily-patterns.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        self._save_figure('daily-patterns.png')
     
     def create_subscriptions_chart(self, data):
         """Create subscriptions analysis chart."""
+        plt = self._pyplot()
         # Filter for subscriptions
-        subs = data[data['category'] == 'Subscriptions'].copy()
-        subs['amount'] = abs(subs['amount'])
-        subs['month'] = subs['date'].dt.to_period('M')
+        cube = self.aggregate_cube(data)
+        subs_by_month = cube.rollup('month', category='Subscriptions')
+        subs_by_merchant = cube.rollup('merchant', category='Subscriptions')
         
-        if subs.empty:
+        if subs_by_month.empty:
             return
         
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
         fig.suptitle('Subscription Spending Analysis', fontsize=16, fontweight='bold')
         
         # Monthly subscription spending
-        monthly_subs = subs.groupby('month')['amount'].sum()
+        monthly_subs = subs_by_month['gross']
         ax1.plot(range(len(monthly_subs)), monthly_subs.values, 
                 marker='o', color='purple', linewidth=3)
         ax1.set_title('Monthly Subscription Spending')
@@ -324,7 +880,7 @@ class SampleDataGenerator:
         ax1.grid(True, alpha=0.3)
         
         # Top subscription services
-        sub_totals = subs.groupby('merchant')['amount'].sum().sort_values(ascending=True)
+        sub_totals = subs_by_merchant['gross'].sort_values(ascending=True)
         ax2.barh(range(len(sub_totals)), sub_totals.values, color='mediumpurple')
         ax2.set_yticks(range(len(sub_totals)))
         ax2.set_yticklabels(sub_totals.index)
@@ -332,7 +888,7 @@ class SampleDataGenerator:
         ax2.set_xlabel('Total Amount ($)')
         
         # Monthly transaction count
-        monthly_count = subs.groupby('month').size()
+        monthly_count = subs_by_month['count']
         ax3.bar(range(len(monthly_count)), monthly_count.values, 
                color='plum', alpha=0.8)
         ax3.set_title('Monthly Subscription Transaction Count')
@@ -341,21 +897,33 @@ class SampleDataGenerator:
         ax3.set_xticklabels([str(m) for m in monthly_count.index[::2]], rotation=45)
         
         # Average amount per service
-        avg_amounts = subs.groupby('merchant')['amount'].mean()
+        avg_amounts = subs_by_merchant['gross_mean']
         ax4.pie(avg_amounts.values, labels=avg_amounts.index, autopct='$%1.0f',
                colors=plt.cm.Set3.colors)
         ax4.set_title('Average Amount per Subscription Service')
         
         plt.tight_layout()
-        plt.savefig(self.images_dir / 'subscriptions-analysis.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        self._save_figure('subscriptions-analysis.png')
     
     def create_interactive_dashboard_preview(self, data):
-        """Create a sample interactive dashboard using Plotly."""
+        """
+        Create a sample interactive dashboard using Plotly.
+
+        The HTML export follows self.html_settings (see HTML_EXPORTS).
+        """
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+        
+        settings = self.html_settings
+        
+        def compact(series):
+            return decimate_series(series, settings["max_points"]).astype(settings["dtype"])
+        
         # Create sample plotly chart
-        monthly_data = data.groupby([data['date'].dt.to_period('M')])['amount'].sum()
-        monthly_income = data[data['amount'] > 0].groupby(data['date'].dt.to_period('M'))['amount'].sum()
-        monthly_expenses = data[data['amount'] < 0].groupby(data['date'].dt.to_period('M'))['amount'].sum()
+        cube = self.aggregate_cube(data)
+        monthly = cube.rollup('month')
+        monthly_income = compact(monthly.loc[monthly['income_count'] > 0, 'income'])
+        monthly_expenses = compact(monthly.loc[monthly['expense_count'] > 0, 'expense'])
         
         fig = make_subplots(
             rows=2, cols=2,
@@ -372,15 +940,14 @@ class SampleDataGenerator:
             row=1, col=1
         )
         fig.add_trace(
-            go.Scatter(x=[str(m) for m in monthly_expenses.index], y=abs(monthly_expenses.values),
+            go.Scatter(x=[str(m) for m in monthly_expenses.index], y=monthly_expenses.values,
                       name="Expenses", line=dict(color="red")),
             row=1, col=1
         )
         
         # Category pie chart
-        expenses = data[data['amount'] < 0].copy()
-        expenses['amount'] = abs(expenses['amount'])
-        category_totals = expenses.groupby('category')['amount'].sum()
+        categories = cube.rollup('category')
+        category_totals = categories.loc[categories['expense_count'] > 0, 'expense'].astype(settings["dtype"])
         
         fig.add_trace(
             go.Pie(labels=category_totals.index, values=category_totals.values,
@@ -389,7 +956,7 @@ class SampleDataGenerator:
         )
         
         # Net amount
-        net_amount = monthly_income + monthly_expenses
+        net_amount = compact(monthly['net'])
         fig.add_trace(
             go.Bar(x=[str(m) for m in net_amount.index], y=net_amount.values,
                   name="Net Amount", 
@@ -398,9 +965,7 @@ class SampleDataGenerator:
         )
         
         # Daily patterns
-        expenses['day_of_week'] = expenses['date'].dt.day_name()
-        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        daily_spending = expenses.groupby('day_of_week')['amount'].sum().reindex(day_order)
+        daily_spending = cube.daily_expenses().astype(settings["dtype"])
         
         fig.add_trace(
             go.Bar(x=daily_spending.index, y=daily_spending.values,
@@ -416,44 +981,275 @@ class SampleDataGenerator:
         )
         
         # Save as HTML for documentation
-        fig.write_html(self.images_dir / "interactive-dashboard-preview.html")
+        with self._phase("encode"):
+            fig.write_html(self.images_dir / "interactive-dashboard-preview.html",
+                           include_plotlyjs=settings["include_plotlyjs"])
         
-        # Also save a static image (skip if kaleido not available)
+        # Also save a static image, drawn with matplotlib when plotly cannot export one
+        if _kaleido_available():
+            with self._phase("encode"):
+                fig.write_image(self.images_dir / "dashboard-overview.png", width=1200, height=800)
+        else:
+            self._create_dashboard_overview(monthly_income, monthly_expenses, category_totals,
+                                            net_amount, daily_spending)
+    
+    def _create_dashboard_overview(self, monthly_income, monthly_expenses, category_totals,
+                                   net_amount, daily_spending):
+        """
+        Draw the four dashboard panels with matplotlib as dashboard-overview.png.
+
+        Takes the aggregates already computed for the interactive preview and
+        renders at 100 dpi, matching the 1200x800 plotly export.
+        """
+        plt = self._pyplot()
+        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(12, 8))
+        fig.suptitle('Budget Dashboard - Overview', fontsize=16, fontweight='bold')
+        
+        # Monthly income vs expenses
+        ax1.plot(monthly_income.index.astype(str), monthly_income.values, color='green', label='Income')
+        ax1.plot(monthly_expenses.index.astype(str), monthly_expenses.values, color='red', label='Expenses')
+        ax1.set_title('Monthly Income vs Expenses')
+        ax1.tick_params(axis='x', rotation=45, labelsize=8)
+        ax1.legend()
+        
+        # Category breakdown
+        ax2.pie(category_totals.values, labels=category_totals.index, autopct='%1.0f%%',
+                textprops={'fontsize': 8})
+        ax2.set_title('Category Breakdown')
+        
+        # Net amount
+        colors = ['green' if x > 0 else 'red' for x in net_amount.values]
+        ax3.bar(net_amount.index.astype(str), net_amount.values, color=colors)
+        ax3.set_title('Monthly Net Amount')
+        ax3.tick_params(axis='x', rotation=45, labelsize=8)
+        
+        # Daily patterns
+        ax4.bar(daily_spending.index, daily_spending.values, color='lightblue')
+        ax4.set_title('Daily Patterns')
+        ax4.tick_params(axis='x', rotation=45, labelsize=8)
+        
+        plt.tight_layout()
+        self._save_figure('dashboard-overview.png', dpi=100)
+    
+    def generate_all_documentation_assets(self, n_transactions=2000, jobs=1, use_cache=True, compact=False,
+                                          timings_path=None, profiler=None, profile_output=None):
+        """
+        Generate all charts and assets for documentation.
+
+        Every stage is timed (wall, CPU, RSS high-water mark) and each rendered chart is
+        broken down into aggregation, figure build and encode time. The
+        report is written as JSON at the end of the run.
+
+        Args:
+            n_transactions: Number of sample transactions to chart
+            jobs: Number of worker processes used to render charts (1 renders in-process)
+            use_cache: Skip charts whose fingerprint matches the asset manifest
+            compact: Generate the sample data in the compact layout
+            timings_path: JSON report path (defaults to TIMINGS_NAME in the images directory)
+            profiler: Optionally run the build under 'cprofile' or 'pyinstrument'
+                (with jobs > 1 only the parent process is profiled)
+            profile_output: Profiler output file (defaults to asset-build.prof / .html)
+
+        Returns:
+            dict: The timing report
+        """
+        instrumentation = self.instrumentation = RunInstrumentation()
+        if profile_output is None:
+            profile_output = "asset-build.html" if profiler == "pyinstrument" else "asset-build.prof"
+        
+        run_start = time.perf_counter()
         try:
-            fig.write_image(self.images_dir / "dashboard-overview.png", width=1200, height=800)
-        except Exception as e:
-            print(f"Skipping PNG export (kaleido not available): {e}")
-            # Create a matplotlib version instead
-            import matplotlib.pyplot as plt
-            fig, ax = plt.subplots(figsize=(12, 8))
-            ax.text(0.5, 0.5, 'Interactive Dashboard Preview\n\nOpen interactive-dashboard-preview.html\nto see the full interactive version', 
-                   ha='center', va='center', fontsize=16, 
-                   bbox=dict(boxstyle="round,pad=1", facecolor="lightblue"))
-            ax.set_xlim(0, 1)
-            ax.set_ylim(0, 1)
-            ax.axis('off')
-            plt.savefig(self.images_dir / 'dashboard-overview.png', dpi=300, bbox_inches='tight')
-            plt.close()
-    
-    def generate_all_documentation_assets(self):
-        """Generate all charts and assets for documentation."""
-        print("Generating sample data for documentation...")
-        data = self.generate_sample_data(2000)
-        
-        print("Creating visualization assets...")
-        self.create_monthly_trends_chart(data)
-        self.create_category_breakdown_chart(data)
-        self.create_top_merchants_chart(data)
-        self.create_income_sources_chart(data)
-        self.create_daily_patterns_chart(data)
-        self.create_subscriptions_chart(data)
-        self.create_interactive_dashboard_preview(data)
+            with instrumentation.profile(profiler, profile_output):
+                print("Generating sample data for documentation...")
+                with instrumentation.stage("generate_data"):
+                    data = self.generate_sample_data(n_transactions, compact=compact)
+                print(f"Sample data: {len(data):,} rows, {memory_report(data)['total'] / 1e6:.2f} MB in memory")
+                with instrumentation.stage("aggregate_cube"):
+                    cube = self.aggregate_cube(data)
+                
+                cache = AssetCache(self.images_dir / MANIFEST_NAME)
+                pending = []
+                fingerprints = {}
+                with instrumentation.stage("cache_check"):
+                    cube_hash = cube.fingerprint() if use_cache else None
+                    for method_name in self.CHART_METHODS:
+                        if use_cache:
+                            fingerprints[method_name] = self.chart_fingerprint(method_name, cube_hash)
+                            outputs = [self.images_dir / name for name in self.chart_outputs(method_name)]
+                            if cache.is_fresh(method_name, fingerprints[method_name], outputs):
+                                continue
+                        pending.append(method_name)
+                
+                print(f"Creating visualization assets ({self.profile} profile)...")
+                with instrumentation.stage("render_charts"):
+                    if jobs > 1 and len(pending) > 1:
+                        instrumentation.charts.update(self._render_charts_parallel(cube, pending, jobs))
+                    else:
+                        for method_name in pending:
+                            with instrumentation.chart(method_name):
+                                getattr(self, method_name)(cube)
+                self._print_render_timings({name: instrumentation.charts[name] for name in pending})
+                
+                if use_cache:
+                    with instrumentation.stage("save_manifest"):
+                        for method_name in pending:
+                            cache.record(method_name, fingerprints[method_name], self.chart_outputs(method_name))
+                        cache.save()
+                    print(cache.report())
+        finally:
+            self.instrumentation = None
+        
+        report = instrumentation.summary(
+            rows=n_transactions,
+            jobs=jobs,
+            render_profile=self.profile,
+            html_export=self.html_export,
+            compact=compact,
+            total_wall_s=time.perf_counter() - run_start,
+            cache={"hits": cache.hits, "misses": cache.misses} if use_cache else None,
+            profiler_output=str(profile_output) if profiler else None
+        )
+        timings_path = Path(timings_path) if timings_path else self.images_dir / TIMINGS_NAME
+        timings_path.write_text(json.dumps(report, indent=2))
         
         print(f"All documentation assets created in {self.images_dir}")
+        print(f"Timing report written to {timings_path}")
+        if profiler:
+            print(f"Profile written to {profile_output}")
         print("\nGenerated files:")
         for file in sorted(self.images_dir.glob("*")):
             print(f"  - {file.name}")
+        return report
+    
+    def chart_outputs(self, method_name):
+        """Files a chart needs on disk, including the shared plotly.js bundle for HTML dashboards."""
+        outputs = list(self.CHART_OUTPUTS[method_name])
+        if self.html_settings["include_plotlyjs"] == "directory" and any(name.endswith(".html") for name in outputs):
+            outputs.append("plotly.min.js")
+        return outputs
+    
+    def chart_fingerprint(self, method_name, cube_hash):
+        """
+        Fingerprint a chart from its aggregate input and its rendering code.
+
+        The chart method source, the shared rendering helpers (global style,
+        figure saving, the matplotlib dashboard fallback) and the AggregateCube
+        source stand in for the chart's parameters (sizes, styling), so editing
+        any of them re-renders it; the render profile (dpi, bbox), HTML export
+        settings and installed kaleido version are hashed explicitly.
+        """
+        cls = type(self)
+        helpers = (_load_pyplot, decimate_series, cls._pyplot, cls._save_figure, cls._create_dashboard_overview)
+        digest = hashlib.sha256()
+        digest.update(cube_hash.encode())
+        digest.update(inspect.getsource(getattr(cls, method_name)).encode())
+        for helper in helpers:
+            digest.update(inspect.getsource(helper).encode())
+        digest.update(inspect.getsource(AggregateCube).encode())
+        digest.update(json.dumps(self.render_profile, sort_keys=True).encode())
+        if any(name.endswith(".html") for name in self.CHART_OUTPUTS[method_name]):
+            digest.update(json.dumps(self.html_settings, sort_keys=True).encode())
+        if method_name == "create_interactive_dashboard_preview":
+            # dashboard-overview.png is drawn by plotly or matplotlib depending on kaleido.
+            # The export probe starts Chrome on kaleido 1.x, so it only runs when the
+            # dashboard renders; installing or upgrading kaleido still invalidates it.
+            digest.update(f"kaleido={_kaleido_version()}".encode())
+        return digest.hexdigest()
+    
+    def _print_render_timings(self, timings):
+        """Print wall-clock time, its aggregate/build/encode split and output size per rendered chart."""
+        if timings:
+            print(f"  {'chart':<40} {'wall':>8} {'agg':>7} {'build':>7} {'encode':>7} {'size':>12}")
+        for method_name, record in timings.items():
+            paths = [self.images_dir / name for name in self.CHART_OUTPUTS[method_name]]
+            size_kb = sum(path.stat().st_size for path in paths if path.exists()) / 1024
+            print(f"  {method_name:<40} {record['wall_s']:7.2f}s {record['aggregate_s']:6.2f}s "
+                  f"{record['build_s']:6.2f}s {record['encode_s']:6.2f}s {size_kb:9.1f} KB")
+        if timings:
+            print(f"  {'total':<40} {sum(record['wall_s'] for record in timings.values()):7.2f}s")
+    
+    def _render_charts_parallel(self, cube, method_names, jobs):
+        """
+        Render charts on a process pool.
+
+        The aggregate cube is written once to a temporary file that each worker
+        loads once in its initializer, so tasks only carry the chart method name.
+
+        Returns:
+            dict: Timing record (see RunInstrumentation.chart) per chart method
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cube_path = Path(tmp_dir) / "aggregate_cube.pkl"
+            with open(cube_path, "wb") as f:
+                pickle.dump(cube, f, protocol=pickle.HIGHEST_PROTOCOL)
+            
+            with ProcessPoolExecutor(max_workers=min(jobs, len(method_names)),
+                                     initializer=_init_render_worker,
+                                     initargs=(str(cube_path), str(self.images_dir), self.profile,
+                                               self.html_export)) as pool:
+                futures = {pool.submit(_render_chart, name): name for name in method_names}
+                timings = {}
+                for future in as_completed(futures):
+                    timings[futures[future]] = future.result()
+        return {name: timings[name] for name in method_names}
+
+# Per-process state for parallel rendering (set by _init_render_worker)
+_worker_generator = None
+_worker_cube = None
+
+def _init_render_worker(cube_path, images_dir, profile, html_export):
+    """Load the shared aggregate cube once per worker process."""
+    global _worker_generator, _worker_cube
+    with open(cube_path, "rb") as f:
+        _worker_cube = pickle.load(f)
+    _worker_generator = SampleDataGenerator(profile=profile, html_export=html_export)
+    _worker_generator.images_dir = Path(images_dir)
+    _worker_generator.instrumentation = RunInstrumentation()
+
+def _render_chart(method_name):
+    """Render one chart in a worker process and return its timing record."""
+    instrumentation = _worker_generator.instrumentation
+    with instrumentation.chart(method_name):
+        getattr(_worker_generator, method_name)(_worker_cube)
+    return instrumentation.charts[method_name]
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate sample data and documentation assets.")
+    parser.add_argument("--seed", type=int, default=DOCS_SEED,
+                        help=f"Random seed of the sample data (default: {DOCS_SEED}, so rebuilds hit the asset cache)")
+    parser.add_argument("--rows", type=int, default=2000, help="Sample transactions used for the charts")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes used to render charts")
+    parser.add_argument("--compact", action="store_true",
+                        help="Hold the chart data in the compact layout (categoricals, integer cents)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-render every chart, ignoring the asset manifest")
+    parser.add_argument("--profile", choices=sorted(RENDER_PROFILES), default="publish",
+                        help="Render profile: 'publish' for docs output, 'draft' for fast previews")
+    parser.add_argument("--html-export", choices=sorted(HTML_EXPORTS), default="standalone",
+                        help="'standalone' inlines plotly.js; 'shared' references one plotly.min.js per directory")
+    parser.add_argument("--stream-rows", type=int, default=None,
+                        help="Write this many rows to data/raw in chunks instead of building assets")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000, help="Rows per streamed file")
+    parser.add_argument("--start-date", default=None, help="First day of the streamed range (YYYY-MM-DD)")
+    parser.add_argument("--end-date", default=None, help="Last day of the streamed range (YYYY-MM-DD)")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="Streamed file format")
+    parser.add_argument("--output-dir", default="data/raw", help="Raw data directory for streamed files")
+    parser.add_argument("--timings", default=None,
+                        help=f"JSON timing report path (default: <images dir>/{TIMINGS_NAME})")
+    parser.add_argument("--profiler", choices=["cprofile", "pyinstrument"], default=None,
+                        help="Profile the asset build with cProfile or pyinstrument")
+    parser.add_argument("--profile-output", default=None,
+                        help="Profiler output file (default: asset-build.prof or asset-build.html)")
+    args = parser.parse_args()
+    
+    generator = SampleDataGenerator(seed=args.seed, profile=args.profile, html_export=args.html_export)
+    if args.stream_rows:
+        print(f"Streaming {args.stream_rows:,} sample transactions to {args.output_dir}...")
+        generator.write_sample_data(args.stream_rows, args.output_dir, args.chunk_size,
+                                    args.start_date, args.end_date, args.format)
+    else:
+        generator.generate_all_documentation_assets(args.rows, args.jobs, use_cache=not args.no_cache,
+                                                    compact=args.compact, timings_path=args.timings,
+                                                    profiler=args.profiler, profile_output=args.profile_output)
 
 if __name__ == "__main__":
-    generator = SampleDataGenerator()
-    generator.generate_all_documentation_assets()
+    main()